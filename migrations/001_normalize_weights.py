@@ -1,101 +1,132 @@
 # migrations/001_normalize_weights.py
 
-import shutil
 import sqlite3
-from datetime import datetime
+from contextlib import closing
 from pathlib import Path
-from typing import Optional
 
+from _util import backup_database, configure_connection, migration_applied, record_migration
+
+MIGRATION_VERSION = 1
+
+# Statements used by the weight normalization pass
+SQL_CREATE_TOTALS = """
+    CREATE TEMP TABLE course_totals AS
+    SELECT co.course_id, COALESCE(SUM(c.weight), 0) AS total
+    FROM courses co
+    LEFT JOIN categories c
+        ON c.course_id = co.course_id AND c.category_name != 'Unallocated' COLLATE NOCASE
+    GROUP BY co.course_id
+    HAVING ABS(total - 1.0) > 0.0001
+"""
+
+SQL_DELETE_UNALLOCATED = """
+    DELETE FROM categories
+    WHERE category_name = 'Unallocated' COLLATE NOCASE
+      AND course_id IN (SELECT course_id FROM course_totals WHERE total > 1.0001)
+"""
+
+SQL_UPDATE_WEIGHT = """
+    UPDATE categories
+    SET weight = weight / (
+        SELECT total FROM course_totals t WHERE t.course_id = categories.course_id
+    )
+    WHERE category_name != 'Unallocated' COLLATE NOCASE
+      AND course_id IN (SELECT course_id FROM course_totals WHERE total > 1.0001)
+"""
+
+# Unallocated is matched with NOCASE: older databases have no collation on
+# category_name, so a lowercase 'unallocated' row would dodge a plain conflict target
+SQL_UPDATE_UNALLOCATED = """
+    UPDATE categories
+    SET weight = 1.0 - (
+        SELECT total FROM course_totals t WHERE t.course_id = categories.course_id
+    )
+    WHERE category_name = 'Unallocated' COLLATE NOCASE
+      AND course_id IN (SELECT course_id FROM course_totals WHERE total < 0.9999)
+      AND ABS(weight - (1.0 - (
+          SELECT total FROM course_totals t WHERE t.course_id = categories.course_id
+      ))) > 0.0001
+"""
+
+SQL_INSERT_UNALLOCATED = """
+    INSERT INTO categories (course_id, category_name, weight)
+    SELECT t.course_id, 'Unallocated', 1.0 - t.total
+    FROM course_totals t
+    WHERE t.total < 0.9999
+      AND NOT EXISTS (
+          SELECT 1 FROM categories c
+          WHERE c.course_id = t.course_id AND c.category_name = 'Unallocated' COLLATE NOCASE
+      )
+"""
+
+
+def migrate_course_weights(cursor: sqlite3.Cursor) -> int:
+    """Normalize weights for every course in one pass.
+
+    Returns the number of courses whose weights were changed.
+    """
+    # Temporary indexes for the Unallocated lookups; dropped again below
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cat_course_unalloc ON categories(course_id)
+        WHERE category_name = 'Unallocated' COLLATE NOCASE
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cat_course
+        ON categories(course_id, category_name COLLATE NOCASE)
+    """)
+
+    # Total weight of all categories except Unallocated, for courses not already at 100%
+    cursor.execute(SQL_CREATE_TOTALS)
 
-def backup_database(db_path: Path) -> Optional[Path]:
-    """Create a backup of the database before migration."""
-    if not db_path.exists():
-        return None
+    try:
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(total > 1.0001), 0) FROM course_totals")
+        pending, over_allocated = cursor.fetchone()
+        if not pending:
+            return 0
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_path = db_path.parent / f"{db_path.name}.{timestamp}.bak"
-    shutil.copy2(db_path, backup_path)
-    return backup_path
+        # Over 100%: remove any Unallocated category and scale the rest down
+        cursor.execute(SQL_DELETE_UNALLOCATED)
+        cursor.execute(SQL_UPDATE_WEIGHT)
 
+        # Under 100%: update Unallocated with the remaining weight, or create it
+        cursor.execute(SQL_UPDATE_UNALLOCATED)
+        updated = cursor.rowcount
+        cursor.execute(SQL_INSERT_UNALLOCATED)
 
-def migrate_course_weights(cursor: sqlite3.Cursor, course_id: int) -> None:
-    """Normalize weights for a single course."""
-    # Get all categories except Unallocated
-    cursor.execute("""
-        SELECT category_id, weight
-        FROM categories
-        WHERE course_id = ? AND LOWER(category_name) != 'unallocated'
-    """, (course_id,))
-
-    categories = cursor.fetchall()
-    total_weight = sum(weight for _, weight in categories)
-
-    if abs(total_weight - 1.0) > 0.0001:  # Needs normalization
-        # Check for Unallocated category
-        cursor.execute("""
-            SELECT category_id, weight
-            FROM categories
-            WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-        """, (course_id,))
-
-        unallocated = cursor.fetchone()
-
-        if total_weight < 1.0:  # Need to create/update Unallocated
-            remaining = 1.0 - total_weight
-            if unallocated:
-                cursor.execute("""
-                    UPDATE categories
-                    SET weight = ?
-                    WHERE category_id = ?
-                """, (remaining, unallocated[0]))
-            else:
-                cursor.execute("""
-                    INSERT INTO categories (course_id, category_name, weight)
-                    VALUES (?, 'Unallocated', ?)
-                """, (course_id, remaining))
-        else:  # Need to normalize existing weights
-            scale_factor = 1.0 / total_weight
-            for cat_id, weight in categories:
-                new_weight = weight * scale_factor
-                cursor.execute("""
-                    UPDATE categories
-                    SET weight = ?
-                    WHERE category_id = ?
-                """, (new_weight, cat_id))
-
-            if unallocated:  # Remove any Unallocated category
-                cursor.execute("""
-                    DELETE FROM categories
-                    WHERE category_id = ?
-                """, (unallocated[0],))
+        return over_allocated + updated + cursor.rowcount
+    finally:
+        cursor.execute("DROP TABLE course_totals")
+        cursor.execute("DROP INDEX idx_cat_course_unalloc")
+        cursor.execute("DROP INDEX idx_cat_course")
 
 
 def migrate_database(db_path: Path) -> None:
     """Main migration function."""
+    backup_path = None
     try:
-        # Backup the database
-        backup_path = backup_database(db_path)
-        if backup_path:
-            print(f"Created backup at: {backup_path}")
-
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Get all courses
-        cursor.execute("SELECT course_id FROM courses")
-        courses = cursor.fetchall()
-
-        for (course_id,) in courses:
-            try:
-                migrate_course_weights(cursor, course_id)
-                conn.commit()
-                print(f"Migrated weights for course ID: {course_id}")
-            except Exception as e:
-                conn.rollback()
-                print(f"Error migrating course {course_id}: {str(e)}")
-                raise
+        # Transactions are managed explicitly below
+        with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+            cursor = conn.cursor()
+
+            if migration_applied(cursor, MIGRATION_VERSION):
+                print("Migration already applied; nothing to do")
+                return
+
+            # Backup the database
+            backup_path = backup_database(conn, db_path, Path(__file__).stem)
+            if backup_path:
+                print(f"Created backup at: {backup_path}")
 
+            # Bulk-write settings for the duration of the migration
+            configure_connection(cursor)
+
+            # Commits on success, rolls back if anything raises
+            with conn:
+                cursor.execute("BEGIN")
+                migrated = migrate_course_weights(cursor)
+                record_migration(cursor, MIGRATION_VERSION)
+
+        print(f"Migrated weights for {migrated} course(s)")
         print("\nMigration completed successfully!")
 
     except Exception as e:
@@ -103,9 +134,6 @@ def migrate_database(db_path: Path) -> None:
         if backup_path:
             print(f"Restore from backup at: {backup_path}")
         raise
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 
 if __name__ == "__main__":
@@ -1,70 +1,109 @@
 # migrations/002_add_credit_hours.py
 
+import re
 import sqlite3
-from datetime import datetime
+from contextlib import closing
 from pathlib import Path
-import shutil
-from typing import Optional
 
+from _util import backup_database, configure_connection, migration_applied, record_migration
 
-def backup_database(db_path: Path) -> Optional[Path]:
-    """Create a backup of the database before migration."""
-    if not db_path.exists():
-        return None
+MIGRATION_VERSION = 2
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_path = db_path.parent / f"{db_path.name}.{timestamp}.bak"
-    shutil.copy2(db_path, backup_path)
-    return backup_path
+# The relaxed constraint this migration installs; PRAGMA table_info can't report CHECKs
+CREDIT_HOURS_CHECK = re.compile(r"CHECK\s*\(\s*credit_hours\s*>=\s*0\s*\)", re.IGNORECASE)
+
+
+def has_relaxed_check(cursor: sqlite3.Cursor) -> bool:
+    """Return True if the courses DDL already allows zero credit hours."""
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'courses'")
+    row = cursor.fetchone()
+    return bool(row and row[0] and CREDIT_HOURS_CHECK.search(row[0]))
+
+
+def rebuild_courses_table(cursor: sqlite3.Cursor) -> None:
+    """Recreate the courses table with the expected credit_hours definition."""
+    # SQLite can't alter a column's constraints in place, so copy through a new table
+    cursor.execute(
+        "CREATE TABLE courses_new AS SELECT course_id, course_code, course_title, semester, credit_hours FROM courses")
+    cursor.execute("DROP TABLE courses")
+    cursor.execute("""
+        CREATE TABLE courses (
+            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_code TEXT NOT NULL,
+            course_title TEXT NOT NULL,
+            semester TEXT NOT NULL,
+            credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours >= 0)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO courses (course_id, course_code, course_title, semester, credit_hours)
+        SELECT course_id, course_code, course_title, semester,
+               CASE WHEN credit_hours >= 0 THEN credit_hours ELSE 3 END
+        FROM courses_new
+    """)
+    cursor.execute("DROP TABLE courses_new")
+
+    # Build the uniqueness index once the rows are in, rather than per insert
+    cursor.execute("CREATE UNIQUE INDEX idx_courses_code_sem ON courses(course_code, semester)")
 
 
 def migrate_database(db_path: Path) -> None:
     """Add credit_hours column to courses table."""
+    backup_path = None
     try:
-        # Backup the database
-        backup_path = backup_database(db_path)
-        if backup_path:
-            print(f"Created backup at: {backup_path}")
-
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        try:
-            # First try to remove the column if it exists (SQLite doesn't support ALTER TABLE DROP COLUMN)
-            cursor.execute(
-                "CREATE TABLE courses_new AS SELECT course_id, course_code, course_title, semester FROM courses")
-            cursor.execute("DROP TABLE courses")
-            cursor.execute("""
-                CREATE TABLE courses (
-                    course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    course_code TEXT NOT NULL,
-                    course_title TEXT NOT NULL,
-                    semester TEXT NOT NULL,
-                    credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours >= 0),
-                    UNIQUE(course_code, semester)
-                )
-            """)
-            cursor.execute(
-                "INSERT INTO courses (course_id, course_code, course_title, semester, credit_hours) SELECT course_id, course_code, course_title, semester, 3 FROM courses_new")
-            cursor.execute("DROP TABLE courses_new")
-
-            conn.commit()
-            print("\nMigration completed successfully!")
-            print("Recreated courses table with credit_hours column (allows zero credits)")
-
-        except sqlite3.OperationalError as e:
-            print(f"Migration error: {e}")
-            raise
+        # Transactions are managed explicitly below
+        with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+            cursor = conn.cursor()
+
+            if migration_applied(cursor, MIGRATION_VERSION):
+                print("Migration already applied; nothing to do")
+                return
+
+            # Backup the database
+            backup_path = backup_database(conn, db_path, Path(__file__).stem)
+            if backup_path:
+                print(f"Created backup at: {backup_path}")
+
+            # Bulk-write settings for the duration of the migration
+            configure_connection(cursor)
+
+            try:
+                # Commits on success, rolls back if anything raises
+                with conn:
+                    cursor.execute("BEGIN")
+                    cursor.execute("PRAGMA table_info(courses)")
+                    columns = {row[1]: row for row in cursor.fetchall()}
+                    credit_hours = columns.get("credit_hours")
+
+                    if credit_hours is None:
+                        # Plain schema edit; existing rows pick up the default
+                        cursor.execute("""
+                            ALTER TABLE courses
+                            ADD COLUMN credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours >= 0)
+                        """)
+                        message = "Added credit_hours column to courses table (allows zero credits)"
+                    elif ((credit_hours[2].upper(), credit_hours[3], credit_hours[4]) == ("INTEGER", 1, "3")
+                          and has_relaxed_check(cursor)):
+                        message = "credit_hours column already present; nothing to change"
+                    else:
+                        # Column exists with a different definition; rebuild the table
+                        rebuild_courses_table(cursor)
+                        message = "Recreated courses table with credit_hours column (allows zero credits)"
+
+                    record_migration(cursor, MIGRATION_VERSION)
+
+            except sqlite3.OperationalError as e:
+                print(f"Migration error: {e}")
+                raise
+
+        print("\nMigration completed successfully!")
+        print(message)
 
     except Exception as e:
         print(f"Migration failed: {str(e)}")
         if backup_path:
             print(f"Restore from backup at: {backup_path}")
         raise
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+# migrations/003_add_lookup_indexes.py
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from _util import backup_database, configure_connection, migration_applied, record_migration
+
+MIGRATION_VERSION = 3
+
+# Indexes new databases get from Gradebook.create_indexes. idx_assignments_course
+# supersedes the older single-column idx_assign_course.
+SQL_LOOKUP_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_courses_semester
+        ON courses(semester DESC, course_code);
+    CREATE INDEX IF NOT EXISTS idx_assign_cat ON assignments(category_id);
+    DROP INDEX IF EXISTS idx_assign_course;
+    CREATE INDEX IF NOT EXISTS idx_assignments_course
+        ON assignments(course_id, entry_date, category_id);
+"""
+
+
+def migrate_database(db_path: Path) -> None:
+    """Bring an existing database's lookup indexes up to date."""
+    backup_path = None
+    try:
+        # Transactions are managed explicitly below
+        with closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
+            cursor = conn.cursor()
+
+            if migration_applied(cursor, MIGRATION_VERSION):
+                print("Migration already applied; nothing to do")
+                return
+
+            # Backup the database
+            backup_path = backup_database(conn, db_path, Path(__file__).stem)
+            if backup_path:
+                print(f"Created backup at: {backup_path}")
+
+            # Bulk-write settings for the duration of the migration
+            configure_connection(cursor)
+
+            # Commits on success, rolls back if anything raises
+            with conn:
+                cursor.execute("BEGIN")
+                for statement in SQL_LOOKUP_INDEXES.split(";"):
+                    if statement.strip():
+                        cursor.execute(statement)
+                record_migration(cursor, MIGRATION_VERSION)
+
+            # Give the planner statistics for the new indexes
+            cursor.execute("PRAGMA optimize")
+
+        print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Migration failed: {str(e)}")
+        if backup_path:
+            print(f"Restore from backup at: {backup_path}")
+        raise
+
+
+if __name__ == "__main__":
+    db_path = Path("~/.gradebook/gradebook.db").expanduser()
+    migrate_database(db_path)
@@ -0,0 +1,63 @@
+# migrations/_util.py
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+def backup_database(conn: sqlite3.Connection, db_path: Path, migration: str) -> Optional[Path]:
+    """Create a backup of the database before migration.
+
+    The backup is named after the migration and a microsecond timestamp, so
+    migrations run back to back never share a file; an existing file is
+    never overwritten.
+    """
+    if not db_path.exists():
+        return None
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    backup_path = db_path.parent / f"{db_path.name}.{migration}.{timestamp}.bak"
+    if backup_path.exists():
+        raise FileExistsError(f"Backup file already exists: {backup_path}")
+    # Page-level copy through SQLite's online backup API
+    with closing(sqlite3.connect(backup_path)) as target:
+        conn.backup(target, pages=1000)
+    return backup_path
+
+
+def configure_connection(cursor: sqlite3.Cursor) -> None:
+    """Apply bulk-write settings for the duration of a migration."""
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA cache_size = -65536")  # 64 MiB
+    cursor.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+
+
+def migration_applied(cursor: sqlite3.Cursor, version: int) -> bool:
+    """Check whether a migration version is recorded in schema_migrations."""
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name='schema_migrations'
+    """)
+    if not cursor.fetchone():
+        return False
+
+    cursor.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,))
+    return cursor.fetchone() is not None
+
+
+def record_migration(cursor: sqlite3.Cursor, version: int) -> None:
+    """Record a migration version as applied."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO schema_migrations (version, applied_at)
+        VALUES (?, datetime('now'))
+    """, (version,))
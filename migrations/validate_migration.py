@@ -1,103 +1,120 @@
 # migrations/validate_migration.py
 
+import argparse
 import sys
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import List, Optional, Tuple
+
 from gradebook.db import Gradebook
 
+CourseCategories = List[Tuple[str, float, int, float, float]]
+CourseRows = List[Tuple[str, Optional[float], CourseCategories]]
 
-def validate_category_weights(gradebook: Gradebook) -> bool:
-    """Verify all courses have properly normalized weights."""
+
+def load_course_categories(gradebook: Gradebook) -> CourseRows:
+    """Load weight and assignment totals per category for every course in one query.
+
+    Each course also carries its weighted grade, computed in SQL with the same rules as
+    Gradebook.calculate_course_grade (None when no graded category contributes).
+    """
     cursor = gradebook.cursor
+    cursor.arraysize = 1024
 
-    cursor.execute("SELECT course_id, course_code FROM courses")
-    courses = cursor.fetchall()
+    cursor.execute("""
+        SELECT c.course_id, c.course_code,
+               cat.category_name, cat.weight,
+               COUNT(a.assignment_id) as assignment_count,
+               COALESCE(SUM(a.earned_points), 0) as earned,
+               COALESCE(SUM(a.max_points), 0) as possible,
+               SUM(CASE WHEN cat.category_name != 'Unallocated' COLLATE NOCASE AND SUM(a.max_points) > 0
+                        THEN SUM(a.earned_points) * 100.0 / SUM(a.max_points) * cat.weight END) OVER course
+                   / SUM(CASE WHEN cat.category_name != 'Unallocated' COLLATE NOCASE AND SUM(a.max_points) > 0
+                              THEN cat.weight END) OVER course as course_grade
+        FROM courses c
+        LEFT JOIN categories cat ON cat.course_id = c.course_id
+        LEFT JOIN assignments a ON a.category_id = cat.category_id
+        GROUP BY c.course_id, cat.category_id
+        WINDOW course AS (PARTITION BY c.course_id)
+        ORDER BY c.course_id, cat.category_name
+    """)
 
-    all_valid = True
-    for course_id, course_code in courses:
-        # Get total weights
-        cursor.execute("""
-            SELECT SUM(weight) 
-            FROM categories 
-            WHERE course_id = ?
-        """, (course_id,))
+    courses = []
+    for (_, course_code), rows in groupby(cursor, key=itemgetter(0, 1)):
+        rows = list(rows)
+        # Courses without categories come back as a single all-NULL category row
+        categories = [row[2:7] for row in rows if row[2] is not None]
+        courses.append((course_code, rows[0][7], categories))
+    return courses
 
-        total_weight = cursor.fetchone()[0] or 0
 
+def validate_category_weights(courses: CourseRows) -> bool:
+    """Verify all courses have properly normalized weights."""
+    all_valid = True
+    for course_code, _, categories in courses:
+        total_weight = sum(weight for _, weight, _, _, _ in categories)
         if abs(total_weight - 1.0) > 0.0001:
-            print(f"[ERROR] Invalid weights for {course_code}: {total_weight:.4f}")
             all_valid = False
 
             # Show category breakdown
-            cursor.execute("""
-                SELECT category_name, weight
-                FROM categories
-                WHERE course_id = ?
-                ORDER BY weight DESC
-            """, (course_id,))
-
-            for name, weight in cursor.fetchall():
-                print(f"  - {name}: {weight:.4f}")
+            lines = [f"[ERROR] Invalid weights for {course_code}: {total_weight:.4f}\n"]
+            lines += [
+                f"  - {name}: {weight:.4f}\n"
+                for name, weight, _, _, _ in sorted(categories, key=itemgetter(1), reverse=True)
+            ]
+            sys.stdout.write("".join(lines))
 
     return all_valid
 
 
-def validate_grade_calculations(gradebook: Gradebook) -> bool:
-    """Verify grade calculations are working correctly."""
-    cursor = gradebook.cursor
-
-    cursor.execute("""
-        SELECT c.course_id, c.course_code,
-               COUNT(DISTINCT a.assignment_id) as assignment_count
-        FROM courses c
-        LEFT JOIN assignments a ON c.course_id = a.course_id
-        GROUP BY c.course_id
-        HAVING assignment_count > 0
-    """)
+def validate_grade_calculations(courses: CourseRows, verbose: bool = False) -> bool:
+    """Verify grade calculations are working correctly.
 
-    courses = cursor.fetchall()
+    Per-course grades are only printed when verbose is set; failures are always reported.
+    """
     all_valid = True
 
-    for course_id, course_code, _ in courses:
-        try:
-            grade = gradebook.calculate_course_grade(course_id)
-            print(f"Successfully calculated grade for {course_code}: {grade:.2f}%")
-
-            # Verify category-level calculations
-            cursor.execute("""
-                SELECT c.category_name, c.weight,
-                       COUNT(a.assignment_id) as assignment_count
-                FROM categories c
-                LEFT JOIN assignments a ON c.category_id = a.category_id
-                WHERE c.course_id = ?
-                GROUP BY c.category_id
-            """, (course_id,))
-
-            for cat_name, weight, count in cursor.fetchall():
-                if count > 0:
-                    print(f"  - {cat_name}: {count} assignments, weight={weight:.2f}")
-
-        except Exception as e:
-            print(f"[ERROR] Failed to calculate grade for {course_code}: {str(e)}")
+    for course_code, course_grade, categories in courses:
+        if not any(count > 0 for _, _, count, _, _ in categories):
+            continue
+
+        # Same rules as Gradebook.calculate_course_grade
+        if abs(sum(weight for _, weight, _, _, _ in categories) - 1.0) > 0.0001:
+            print(f"[ERROR] Failed to calculate grade for {course_code}: "
+                  "Category weights do not sum to 100%")
             all_valid = False
+            continue
+
+        if verbose:
+            grade = round(course_grade, 2) if course_grade is not None else 0.0
+            lines = [f"Successfully calculated grade for {course_code}: {grade:.2f}%\n"]
+            lines += [
+                f"  - {cat_name}: {count} assignments, weight={weight:.2f}\n"
+                for cat_name, weight, count, _, _ in categories
+                if count > 0
+            ]
+            sys.stdout.write("".join(lines))
 
     return all_valid
 
 
-def validate_database(db_path: Path) -> bool:
+def validate_database(db_path: Path, verbose: bool = False) -> bool:
     """Run all validation checks."""
     try:
         print(f"Validating database at: {db_path}")
         print("-" * 50)
 
-        gradebook = Gradebook(db_path)
+        with Gradebook(db_path) as gradebook:
+            courses = load_course_categories(gradebook)
 
         # Check category weights
         print("\nValidating category weights...")
-        weights_valid = validate_category_weights(gradebook)
+        weights_valid = validate_category_weights(courses)
 
         # Check grade calculations
         print("\nValidating grade calculations...")
-        grades_valid = validate_grade_calculations(gradebook)
+        grades_valid = validate_grade_calculations(courses, verbose)
 
         # Overall status
         print("\nValidation Summary")
@@ -110,12 +127,14 @@ def validate_database(db_path: Path) -> bool:
     except Exception as e:
         print(f"Validation failed: {str(e)}")
         return False
-    finally:
-        if 'gradebook' in locals():
-            gradebook.close()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate a migrated gradebook database.")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Show the calculated grade and categories for every course")
+    args = parser.parse_args()
+
     db_path = Path("~/.gradebook/gradebook.db").expanduser()
-    success = validate_database(db_path)
+    success = validate_database(db_path, verbose=args.verbose)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -1,36 +1,67 @@
 # gradebook/cli.py
 
+import csv
+import heapq
 import importlib.metadata
-import statistics
+import io
+import sqlite3
 import sys
 import warnings
-from datetime import datetime, timedelta
-from functools import wraps
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache, wraps
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Tuple
 
 import click
 from rich.console import Group, Console, Text
-from rich.layout import Layout
-from rich.live import Live
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
 from rich import box
 from rich import print as rprint
 
-from gradebook.db import Gradebook
+from gradebook.db import Gradebook, SQL_INSERT_CATEGORY, SQL_SELECT_UNALLOCATED, integrity_message
 
-def create_styled_table(title: str) -> Table:
-    """Create a consistently styled table with neutral background."""
-    return Table(
+def create_styled_table(title: str, columns=()) -> Table:
+    """Create a consistently styled table with neutral background.
+
+    columns is an optional sequence of (header, options) pairs, such as the
+    *_COLUMNS layouts below, added in order.
+    """
+    table = Table(
         title=title,
         box=box.ROUNDED,
         style="white on grey11",        # Very dark grey background
         header_style="bold cyan",       # Keep colored headers
         title_style="bold white"        # Clean white title
     )
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
+
+# Column layouts for the report tables, shared by every invocation
+DISTRIBUTION_COLUMNS = (
+    ("Grade Range", {}),
+    ("Count", {}),
+    ("Distribution", {}),
+)
+SUMMARY_COLUMNS = (
+    ("Course", {"style": "cyan"}),
+    ("Title", {"style": "green"}),
+    ("Semester", {}),
+    ("Assignments", {"justify": "right"}),
+    ("Overall Grade", {"justify": "right", "style": "magenta"}),
+)
+SEMESTER_SUMMARY_COLUMNS = (
+    ("Semester", {"style": "cyan"}),
+    ("Courses", {"justify": "right"}),
+    ("Total Assignments", {"justify": "right"}),
+)
 
 def deprecated(message):
     """Decorator to mark commands as deprecated."""
@@ -42,7 +73,8 @@ def deprecated(message):
         return wrapper
     return decorator
 
-console = Console()
+# Highlighting and emoji substitution are never used and cost a regex pass per print
+console = Console(highlight=False, emoji=False, soft_wrap=True)
 
 DEFAULT_DB_PATH = Path("~/.gradebook/gradebook.db").expanduser()
 if not DEFAULT_DB_PATH.exists():
@@ -50,15 +82,61 @@ if not DEFAULT_DB_PATH.exists():
 
 def format_percentage(value: float) -> str:
     """Format a decimal to percentage with 2 decimal places."""
-    return f"{value * 100:.2f}%"
+    return "%.2f%%" % (value * 100.0)
 
+@lru_cache(maxsize=None)
 def get_version():
     """Get version from Poetry's package metadata."""
     try:
         return importlib.metadata.version("gradebook")
     except importlib.metadata.PackageNotFoundError:
+        # Running from a source checkout that was never installed
         return "unknown"
 
+def print_version(ctx, param, value):
+    """Print the version and exit; metadata is only read when --version is passed."""
+    if not value or ctx.resilient_parsing:
+        return
+    click.echo(f"gradebook, version {get_version()}")
+    ctx.exit()
+
+def paged_output(pager: bool):
+    """Context manager that sends console output through the pager if requested."""
+    return console.pager(styles=True) if pager else nullcontext()
+
+
+# Per-course assignment/category counts and overall grade, prepended to the
+# course listing queries. overall_grade mirrors Gradebook.calculate_course_grade
+# and is NULL when the category weights do not sum to 100%.
+COURSE_TOTALS_CTE = """
+    WITH category_totals AS (
+        SELECT
+            cat.course_id,
+            cat.category_name,
+            cat.weight,
+            COUNT(a.assignment_id) as assignment_count,
+            SUM(a.earned_points) as earned,
+            SUM(a.max_points) as possible
+        FROM categories cat
+        LEFT JOIN assignments a ON cat.category_id = a.category_id
+        GROUP BY cat.category_id
+    ),
+    course_totals AS (
+        SELECT
+            course_id,
+            COUNT(*) as category_count,
+            SUM(assignment_count) as assignment_count,
+            CASE WHEN ABS(SUM(weight) - 1.0) <= 0.0001 THEN COALESCE(ROUND(
+                SUM(CASE WHEN possible > 0 AND category_name != 'Unallocated' COLLATE NOCASE
+                    THEN earned * 100.0 / possible * weight END)
+                / SUM(CASE WHEN possible > 0 AND category_name != 'Unallocated' COLLATE NOCASE
+                    THEN weight END), 2), 0.0)
+            END as overall_grade
+        FROM category_totals
+        GROUP BY course_id
+    )
+"""
+
 
 class GradeBookCLI:
     def __init__(
@@ -76,6 +154,21 @@ class GradeBookCLI:
                 db_path = Path(db_path)
             self.db_path = db_path
             self.gradebook = Gradebook(self.db_path)
+            self._configure_connection()
+
+    def _configure_connection(self) -> None:
+        """Apply per-connection PRAGMAs that make small CLI writes cheap."""
+        try:
+            self.gradebook.conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-20000;
+                PRAGMA mmap_size=268435456;
+            """)
+        except sqlite3.DatabaseError:
+            # Read-only or network filesystems may refuse WAL; keep the defaults
+            pass
 
     def __enter__(self):
         return self
@@ -86,7 +179,13 @@ class GradeBookCLI:
 
 
 @click.group()
-@click.version_option(version=get_version(), prog_name="gradebook")
+@click.option("--version",
+              is_flag=True,
+              is_eager=True,
+              expose_value=False,
+              callback=print_version,
+              help="Show the version and exit."
+              )
 @click.option("--db-path",
               default=None,
               help="Specify the path to the database."
@@ -116,50 +215,65 @@ def add_course(gradebook: GradeBookCLI, course_code: str, course_title: str, sem
     try:
         cursor = gradebook.gradebook.cursor
 
-        # First check if course already exists
-        cursor.execute("""
-            SELECT course_id FROM courses 
-            WHERE course_code = ? AND semester = ?
-        """, (course_code, semester))
-
-        if cursor.fetchone():
+        # Insert unless the course already exists for this semester
+        with gradebook.gradebook.conn:
+            row = cursor.execute("""
+                INSERT INTO courses (course_code, course_title, semester, credit_hours) 
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(course_code, semester) DO NOTHING
+                RETURNING course_id
+            """, (course_code, course_title, semester, credits)).fetchone()
+        gradebook.gradebook.clear_course_cache()
+
+        if row is None:
             console.print(f"[yellow]Course {course_code} already exists for {semester}![/yellow]")
             return
 
-        # Add the course with credit hours
-        cursor.execute("""
-            INSERT INTO courses (course_code, course_title, semester, credit_hours) 
-            VALUES (?, ?, ?, ?)
-        """, (course_code, course_title, semester, credits))
-
-        gradebook.gradebook.conn.commit()
-
-        # Verify the course was added
-        cursor.execute("""
-            SELECT course_id FROM courses 
-            WHERE course_code = ? AND semester = ?
-        """, (course_code, semester))
-
-        result = cursor.fetchone()
-        if result:
-            course_id = result[0]
-            console.print(f"[green]Successfully added course:[/green] {course_code}: {course_title} ({semester}, {credits} credits)")
-            console.print(f"[dim]Debug: Added course with ID {course_id}[/dim]")
-            console.print(f"Now add categories with: gradebook add categories {course_code}")
-        else:
-            console.print("[red]Failed to verify course was added![/red]")
+        console.print(f"[green]Successfully added course:[/green] {course_code}: {course_title} ({semester}, {credits} credits)")
+        console.print(f"Now add categories with: gradebook add categories {course_code}")
 
     except Exception as e:
-        gradebook.gradebook.conn.rollback()
         console.print(f"[red]Error adding course:[/red] {str(e)}")
 
 
+def parse_category_spec(spec: str) -> List[Tuple[str, float]]:
+    """Parse a "Name:weight,Name:weight" spec into (name, weight) pairs."""
+    try:
+        categories = [(name.strip(), float(weight))
+                      for name, weight in (part.rsplit(':', 1) for part in spec.split(','))]
+    except ValueError:
+        raise click.BadParameter("Expected 'Name:weight,...', e.g. 'Homework:0.4,Exams:0.6'",
+                                 param_hint="'--spec'")
+
+    seen = set()
+    for name, weight in categories:
+        if not name:
+            raise click.BadParameter("Category names cannot be empty", param_hint="'--spec'")
+        # Category names are unique per course regardless of case
+        if name.casefold() in seen:
+            raise click.BadParameter(f"Duplicate category name: {name}", param_hint="'--spec'")
+        seen.add(name.casefold())
+        if not 0 < weight <= 1:
+            raise click.BadParameter(f"Weight for {name} must be between 0 and 1 (got {weight})",
+                                     param_hint="'--spec'")
+
+    total_weight = sum(weight for _, weight in categories)
+    if abs(total_weight - 1.0) > 0.0001:
+        raise click.BadParameter(f"Weights must sum to 100% (got {format_percentage(total_weight)})",
+                                 param_hint="'--spec'")
+    return categories
+
 @add.command('categories')
 @click.argument('course_code')
 @click.option('--semester', help="Specify semester if course exists in multiple semesters")
+@click.option('--spec', default=None,
+              help="Categories as 'Name:weight,...' (e.g. 'Homework:0.4,Exams:0.6'); skips the prompts")
 @click.pass_obj
-def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str):
+def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str, spec: str):
     """Add or update categories for a course while preserving existing assignments."""
+    # Validate the spec before touching the database so bad input fails fast
+    spec_categories = parse_category_spec(spec) if spec else None
+
     try:
         cursor = gradebook.gradebook.cursor
         course_id = gradebook.gradebook.get_course_id_by_code(course_code)
@@ -180,7 +294,8 @@ def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str):
         if category_count > 0:
             # Show current categories if they exist
             cursor.execute("""
-                SELECT c.category_name, c.weight, COUNT(a.assignment_id) as assignment_count
+                SELECT c.category_name, printf('%.1f%%', c.weight * 100),
+                       CAST(COUNT(a.assignment_id) AS TEXT) as assignment_count
                 FROM categories c
                 LEFT JOIN assignments a ON c.category_id = a.category_id
                 WHERE c.course_id = ?
@@ -197,45 +312,22 @@ def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str):
             table.add_column("Weight", style="magenta")
             table.add_column("Assignments", justify="right")
 
-            for name, weight, count in current_categories:
-                table.add_row(name, f"{weight * 100:.1f}%", str(count))
+            for row in current_categories:
+                table.add_row(*row)
 
             console.print(table)
 
-            if not Confirm.ask("Do you want to update these categories?"):
+            if spec_categories is None and not Confirm.ask("Do you want to update these categories?"):
                 return
 
             if assignment_count > 0:
                 console.print(f"\n[yellow]Note: {assignment_count} existing assignments will be preserved[/yellow]")
 
-            # Create temporary category for assignments if needed
-            if assignment_count > 0:
-                cursor.execute("""
-                    INSERT INTO categories (course_id, category_name, weight)
-                    VALUES (?, '_temp_category_', 0.0)
-                """, (course_id,))
-                temp_category_id = cursor.lastrowid
-
-                # Move all assignments to temporary category
-                cursor.execute("""
-                    UPDATE assignments
-                    SET category_id = ?
-                    WHERE category_id IN (
-                        SELECT category_id FROM categories WHERE course_id = ? AND category_name != '_temp_category_'
-                    )
-                """, (temp_category_id, course_id))
-
-            # Delete old categories (except temporary)
-            cursor.execute("""
-                DELETE FROM categories 
-                WHERE course_id = ? AND category_name != '_temp_category_'
-            """, (course_id,))
-
         # Collect new categories
-        categories = []
+        categories = spec_categories or []
         total_weight = 0.0
 
-        while total_weight <= 1.0:
+        while spec_categories is None and total_weight <= 1.0:
             remaining = 1.0 - total_weight
             console.print(f"\nRemaining weight available: [cyan]{format_percentage(remaining)}[/cyan]")
 
@@ -260,47 +352,59 @@ def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str):
 
         if categories:
             try:
-                # Add new categories
-                for name, weight in categories:
-                    cursor.execute("""
-                        INSERT INTO categories (course_id, category_name, weight)
-                        VALUES (?, ?, ?)
-                    """, (course_id, name, weight))
+                # Replace the categories in a single write transaction
+                with gradebook.gradebook.conn:
+                    cursor.execute("BEGIN IMMEDIATE")
 
-                # If there were existing assignments, distribute them
-                if assignment_count > 0:
-                    # Get the first category as default
-                    cursor.execute("""
-                        SELECT category_id, category_name FROM categories 
-                        WHERE course_id = ? AND category_name != '_temp_category_'
-                        LIMIT 1
-                    """, (course_id,))
-                    default_category = cursor.fetchone()
+                    if assignment_count > 0:
+                        # Park existing assignments in a temporary category
+                        cursor.execute(SQL_INSERT_CATEGORY, (course_id, '_temp_category_', 0.0))
+                        temp_category_id = cursor.lastrowid
 
-                    if default_category:
-                        default_category_id, default_category_name = default_category
-
-                        # Move assignments to the default category
                         cursor.execute("""
                             UPDATE assignments
                             SET category_id = ?
                             WHERE category_id IN (
-                                SELECT category_id FROM categories 
-                                WHERE course_id = ? AND category_name = '_temp_category_'
+                                SELECT category_id FROM categories WHERE course_id = ? AND category_name != '_temp_category_'
                             )
-                        """, (default_category_id, course_id))
+                        """, (temp_category_id, course_id))
 
-                        console.print(
-                            f"\n[yellow]Note: Existing assignments have been moved to '{default_category_name}'[/yellow]")
-                        console.print("[yellow]Use 'gradebook move assignment' to redistribute them as needed[/yellow]")
-
-                    # Delete temporary category
+                    # Delete old categories (except temporary)
                     cursor.execute("""
                         DELETE FROM categories 
-                        WHERE course_id = ? AND category_name = '_temp_category_'
+                        WHERE course_id = ? AND category_name != '_temp_category_'
                     """, (course_id,))
 
-                gradebook.gradebook.conn.commit()
+                    # Add new categories
+                    cursor.executemany(SQL_INSERT_CATEGORY, [(course_id, name, weight) for name, weight in categories])
+
+                    # If there were existing assignments, distribute them
+                    if assignment_count > 0:
+                        # Get the first category as default
+                        cursor.execute("""
+                            SELECT category_id, category_name FROM categories 
+                            WHERE course_id = ? AND category_name != '_temp_category_'
+                            LIMIT 1
+                        """, (course_id,))
+                        default_category = cursor.fetchone()
+
+                        if default_category:
+                            default_category_id, default_category_name = default_category
+
+                            # Move assignments to the default category
+                            cursor.execute("""
+                                UPDATE assignments
+                                SET category_id = ?
+                                WHERE category_id = ?
+                            """, (default_category_id, temp_category_id))
+
+                            console.print(
+                                f"\n[yellow]Note: Existing assignments have been moved to '{default_category_name}'[/yellow]")
+                            console.print("[yellow]Use 'gradebook move assignment' to redistribute them as needed[/yellow]")
+
+                        # Delete temporary category
+                        cursor.execute("DELETE FROM categories WHERE category_id = ?", (temp_category_id,))
+
                 console.print("[green]Successfully updated categories![/green]")
 
                 table = create_styled_table(title="\nNew Categories")
@@ -313,7 +417,6 @@ def add_categories(gradebook: GradeBookCLI, course_code: str, semester: str):
                 console.print(table)
 
             except Exception as e:
-                gradebook.gradebook.conn.rollback()
                 console.print(f"[red]Error updating categories:[/red] {str(e)}")
 
     except Exception as e:
@@ -335,9 +438,10 @@ def add_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
 
         # Verify category doesn't already exist
         cursor.execute("""
-            SELECT category_name, weight 
+            SELECT 1 
             FROM categories 
             WHERE course_id = ? AND category_name = ?
+            LIMIT 1
         """, (course_id, category_name))
 
         if cursor.fetchone():
@@ -353,11 +457,7 @@ def add_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
             return
 
         # Look for Unallocated category
-        cursor.execute("""
-            SELECT category_id, weight 
-            FROM categories 
-            WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-        """, (course_id,))
+        cursor.execute(SQL_SELECT_UNALLOCATED, (course_id,))
 
         unallocated = cursor.fetchone()
         if not unallocated:
@@ -373,33 +473,29 @@ def add_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
             return
 
         # If we get here, update the categories
-        if abs(weight_difference) <= tolerance:
-            # Weights match exactly - remove Unallocated
-            cursor.execute("DELETE FROM categories WHERE category_id = ?", (unallocated_id,))
-        else:
-            # Update Unallocated with remaining weight
-            new_unallocated = unallocated_weight - weight
-            cursor.execute("""
-                UPDATE categories 
-                SET weight = ?
-                WHERE category_id = ?
-            """, (new_unallocated, unallocated_id))
-
-        # Add the new category
-        cursor.execute("""
-            INSERT INTO categories (course_id, category_name, weight)
-            VALUES (?, ?, ?)
-        """, (course_id, category_name, weight))
+        with gradebook.gradebook.conn:
+            if abs(weight_difference) <= tolerance:
+                # Weights match exactly - remove Unallocated
+                cursor.execute("DELETE FROM categories WHERE category_id = ?", (unallocated_id,))
+            else:
+                # Update Unallocated with remaining weight
+                new_unallocated = unallocated_weight - weight
+                cursor.execute("""
+                    UPDATE categories 
+                    SET weight = ?
+                    WHERE category_id = ?
+                """, (new_unallocated, unallocated_id))
 
-        gradebook.gradebook.conn.commit()
+            # Add the new category
+            cursor.execute(SQL_INSERT_CATEGORY, (course_id, category_name, weight))
 
         # Show updated categories
         cursor.execute("""
-            SELECT category_name, weight
+            SELECT category_name, printf('%.1f%%', weight * 100)
             FROM categories
             WHERE course_id = ?
             ORDER BY 
-                CASE WHEN LOWER(category_name) = 'unallocated' THEN 1 ELSE 0 END,
+                CASE WHEN category_name = 'Unallocated' COLLATE NOCASE THEN 1 ELSE 0 END,
                 category_name
         """, (course_id,))
 
@@ -409,13 +505,12 @@ def add_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
         table.add_column("Category", style="cyan")
         table.add_column("Weight", justify="right", style="green")
 
-        for cat_name, cat_weight in categories:
-            table.add_row(cat_name, f"{cat_weight * 100:.1f}%")
+        for row in categories:
+            table.add_row(*row)
 
         console.print(table)
 
     except Exception as e:
-        gradebook.gradebook.conn.rollback()
         console.print(f"[red]Error adding category:[/red] {str(e)}")
 
 
@@ -435,17 +530,6 @@ def add_assignment(gradebook: GradeBookCLI, course_code: str, category_name: str
         gradebook add assignment CHM343 "Homework" "Extra Credit Lab" 10 12
     """
     try:
-        cursor = gradebook.gradebook.cursor
-
-        # Basic validation
-        if max_points <= 0:
-            console.print(f"[red]Error:[/red] Max points must be greater than 0")
-            return
-
-        if earned_points < 0:
-            console.print(f"[red]Error:[/red] Earned points cannot be negative")
-            return
-
         # Get course ID and validate category
         course_id = gradebook.gradebook.get_course_id_by_code(course_code)
         category_id = gradebook.gradebook.get_category_id(course_code, category_name)
@@ -512,14 +596,90 @@ def remove_course(gradebook: GradeBookCLI, course_code: str, semester: str, forc
                 console.print("Operation cancelled.")
                 return
 
-        cursor.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
-        gradebook.gradebook.conn.commit()
+        with gradebook.gradebook.conn:
+            cursor.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
+        gradebook.gradebook.clear_course_cache()
 
         console.print(f"[green]Successfully removed course: {course_code}: {course_title} ({semester})[/green]")
 
     except Exception as e:
         console.print(f"[red]Error removing course:[/red] {str(e)}")
 
+@remove.command('courses')
+@click.argument('course_codes', nargs=-1, required=True)
+@click.option('--semester', help="Only remove sections from this semester")
+@click.option('--force', is_flag=True, help="Skip confirmation prompt")
+@click.pass_obj
+def remove_courses(gradebook: GradeBookCLI, course_codes: Tuple[str, ...], semester: str, force: bool):
+    """Remove several courses at once.
+
+    Example:
+        gradebook remove courses BIO302 CHM343 --semester "Fall 2024"
+    """
+    try:
+        cursor = gradebook.gradebook.cursor
+        codes = list(dict.fromkeys(code.upper() for code in course_codes))
+        placeholders = ', '.join('?' * len(codes))
+
+        query = f"""
+            SELECT c.course_id, c.course_code, c.course_title, c.semester,
+                   (SELECT COUNT(*) FROM assignments WHERE course_id = c.course_id) as assignment_count
+            FROM courses c
+            WHERE c.course_code IN ({placeholders})
+        """
+        params = codes
+        if semester:
+            query += " AND c.semester = ?"
+            params = codes + [semester]
+
+        cursor.execute(query + " ORDER BY c.course_code", params)
+        courses = cursor.fetchall()
+
+        found = defaultdict(list)
+        for course in courses:
+            found[course[1]].append(course)
+
+        missing = [code for code in codes if code not in found]
+        if missing:
+            console.print(f"[red]Error:[/red] Course(s) not found: {', '.join(missing)}")
+            return
+
+        ambiguous = [code for code, sections in found.items() if len(sections) > 1]
+        if ambiguous:
+            console.print(f"[red]Error:[/red] Multiple sections found for {', '.join(ambiguous)}. "
+                          f"Please specify semester.")
+            return
+
+        if not force:
+            table = create_styled_table(title="\nCourses to Remove")
+            table.add_column("Code", style="cyan")
+            table.add_column("Title")
+            table.add_column("Semester")
+            table.add_column("Assignments", justify="right")
+
+            for _, code, title, sem, assignment_count in courses:
+                table.add_row(code, title, sem, str(assignment_count))
+
+            console.print(table)
+            console.print("[yellow]Warning: This will remove these courses and all their categories "
+                          "and assignments![/yellow]")
+            if not Confirm.ask("Are you sure you want to proceed?"):
+                console.print("Operation cancelled.")
+                return
+
+        conn = gradebook.gradebook.conn
+        with conn:
+            cursor.execute(f"DELETE FROM courses WHERE course_id IN ({placeholders})",
+                           [course[0] for course in courses])
+        gradebook.gradebook.clear_course_cache()
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+        console.print(f"[green]Successfully removed {len(courses)} course(s): "
+                      f"{', '.join(course[1] for course in courses)}[/green]")
+
+    except Exception as e:
+        console.print(f"[red]Error removing courses:[/red] {str(e)}")
+
 @remove.command('category')
 @click.argument('course_code')
 @click.argument('category_name')
@@ -532,7 +692,7 @@ def remove_category(gradebook: GradeBookCLI, course_code: str, category_name: st
     """Remove a category by name."""
     try:
         course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
-        category_id = gradebook.gradebook.get_category_id(course_id, category_name)
+        category_id = gradebook.gradebook.get_category_id(course_code, category_name, semester)
 
         cursor = gradebook.gradebook.cursor
         cursor.execute("""
@@ -616,8 +776,8 @@ def remove_assignment(cli: GradeBookCLI, course_code: str, assignment_title: str
                 console.print("Operation cancelled.")
                 return
 
-        cursor.execute("DELETE FROM assignments WHERE assignment_id = ?", (assignment_id,))
-        cli.gradebook.conn.commit()
+        with cli.gradebook.conn:
+            cursor.execute("DELETE FROM assignments WHERE assignment_id = ?", (assignment_id,))
 
         console.print(f"[green]Successfully removed assignment: {assignment_title}[/green]")
 
@@ -648,6 +808,8 @@ def view_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
     Example:
         gradebook show assignment CHM343 "Lab Report 1"
     """
+    from rich.layout import Layout
+
     try:
         course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
         assignment_id = gradebook.gradebook.get_assignment_id(course_code, assignment_title, semester)
@@ -748,18 +910,11 @@ def view_assignments(gradebook: GradeBookCLI, course_code: str, semester: str, s
         gradebook view assignments CHM343 --sort grade --reverse
         gradebook view assignments CHM343 --semester "Fall 2024"
     """
+    import statistics
+
     try:
         cursor = gradebook.gradebook.cursor
-        course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
-
-        # Get course info
-        cursor.execute("""
-            SELECT course_title, semester
-            FROM courses 
-            WHERE course_id = ?
-        """, (course_id,))
-
-        course_title, course_sem = cursor.fetchone()
+        course_id, course_title, course_sem = gradebook.gradebook.get_course_info(course_code, semester)
 
         # Get all assignments with category info
         query = """
@@ -881,8 +1036,10 @@ def view_assignments(gradebook: GradeBookCLI, course_code: str, semester: str, s
 @click.pass_obj
 def view_course(gradebook: GradeBookCLI, course_code: str, semester: str):
     """Show detailed information for a specific course."""
+    from rich.layout import Layout
+
     try:
-        course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
+        course_id, title, sem = gradebook.gradebook.get_course_info(course_code, semester)
         breakdown = gradebook.gradebook.get_grade_breakdown(course_id)
 
         # Create course summary layout
@@ -895,11 +1052,6 @@ def view_course(gradebook: GradeBookCLI, course_code: str, semester: str):
 
         # Header with course info
         cursor = gradebook.gradebook.cursor
-        cursor.execute("""
-            SELECT course_title, semester
-            FROM courses WHERE course_id = ?
-        """, (course_id,))
-        title, sem = cursor.fetchone()
 
         layout["header"].update(Panel(
             f"[bold blue]{course_code}:[/bold blue] {title}\n"
@@ -926,13 +1078,14 @@ def view_course(gradebook: GradeBookCLI, course_code: str, semester: str):
         layout["grades"].update(Panel(table, title="Grade Breakdown"))
 
         # Recent assignments
+        # Rows come back ready to render: date, title, category, score
         cursor.execute("""
             SELECT 
+                substr(a.entry_date, 1, 10),
                 a.title,
-                a.earned_points,
-                a.max_points,
                 c.category_name,
-                a.entry_date
+                printf('%s/%s (%.1f%%)', a.earned_points, a.max_points,
+                       a.earned_points * 100.0 / a.max_points)
             FROM assignments a
             JOIN categories c ON a.category_id = c.category_id
             WHERE a.course_id = ?
@@ -948,11 +1101,9 @@ def view_course(gradebook: GradeBookCLI, course_code: str, semester: str):
             recent_table.add_column("Category", style="cyan")
             recent_table.add_column("Score", justify="right")
 
-            for title, earned, max_points, category, date in recent:
-                date_str = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                score = (earned / max_points) * 100
-                score_str = f"{earned}/{max_points} ({score:.1f}%)"
-                recent_table.add_row(date_str, title, category, score_str)
+            add_row = recent_table.add_row
+            for row in recent:
+                add_row(*row)
 
             layout["recent"].update(Panel(recent_table, title="Recent Assignments"))
 
@@ -965,23 +1116,28 @@ def view_course(gradebook: GradeBookCLI, course_code: str, semester: str):
 @view.command('courses')
 @click.option('--detailed', is_flag=True, help="Show detailed information")
 @click.option('--semester', help="Filter by semester")
+@click.option('--limit', type=click.IntRange(min=0), default=None, help="Show at most this many courses")
+@click.option('--offset', type=click.IntRange(min=0), default=0, help="Skip this many courses first")
+@click.option('--pager', is_flag=True, help="Page the output through the system pager")
 @click.pass_obj
-def view_courses(gradebook: GradeBookCLI, detailed: bool, semester: str):
+def view_courses(gradebook: GradeBookCLI, detailed: bool, semester: str,
+                 limit: int, offset: int, pager: bool):
     """List all courses with grades and statistics."""
     try:
         cursor = gradebook.gradebook.cursor
 
-        query = """
+        query = COURSE_TOTALS_CTE + """
             SELECT 
+                c.course_id,
                 c.course_code, 
                 c.course_title, 
                 c.semester,
                 c.credit_hours,
-                COUNT(DISTINCT a.assignment_id) as assignment_count,
-                COUNT(DISTINCT cat.category_id) as category_count
+                COALESCE(t.assignment_count, 0) as assignment_count,
+                COALESCE(t.category_count, 0) as category_count,
+                t.overall_grade
             FROM courses c
-            LEFT JOIN assignments a ON c.course_id = a.course_id
-            LEFT JOIN categories cat ON c.course_id = cat.course_id
+            LEFT JOIN course_totals t ON c.course_id = t.course_id
             WHERE 1=1
         """
         params = []
@@ -991,9 +1147,10 @@ def view_courses(gradebook: GradeBookCLI, detailed: bool, semester: str):
             params.append(semester)
 
         query += """ 
-            GROUP BY c.course_id 
             ORDER BY c.semester DESC, c.course_code
+            LIMIT ? OFFSET ?
         """
+        params.extend([-1 if limit is None else limit, offset])
 
         cursor.execute(query, params)
         courses = cursor.fetchall()
@@ -1002,56 +1159,63 @@ def view_courses(gradebook: GradeBookCLI, detailed: bool, semester: str):
             console.print("[yellow]No courses found.[/yellow]")
             return
 
-        if detailed:
-            # Create detailed view with grade breakdowns
-            for course in courses:
-                code, title, sem, credits, assign_count, cat_count = course
-
-                panel = Panel(
-                    Group(
-                        Text(f"[bold blue]{code}:[/bold blue] {title}"),
-                        Text(f"[cyan]Semester:[/cyan] {sem}"),
-                        Text(f"[magenta]Credits:[/magenta] {credits}"),
-                        Text(f"[green]Categories:[/green] {cat_count}"),
-                        Text(f"[yellow]Assignments:[/yellow] {assign_count}"),
-                    ),
-                    title=f"Course Details"
-                )
-                console.print(panel)
-
-                if assign_count > 0:
-                    try:
-                        breakdown = gradebook.gradebook.get_grade_breakdown(code)
-                        table = create_styled_table(title="\nGrade Breakdown")
-                        table.add_column("Category", style="cyan")
-                        table.add_column("Weight", justify="right")
-                        table.add_column("Grade", justify="right", style="green")
-
-                        for cat in breakdown['categories']:
-                            table.add_row(
-                                cat['name'],
-                                f"{cat['weight'] * 100:.1f}%",
-                                f"{cat['grade']:.1f}%"
-                            )
-
-                        console.print(table)
-                        console.print(
-                            f"\nOverall Grade: [bold magenta]{breakdown['final_grade']:.1f}%[/bold magenta]\n")
-                    except Exception as e:
-                        console.print(f"[yellow]Could not calculate grades: {str(e)}[/yellow]\n")
-        else:
-            # Create simple table view
-            table = create_styled_table(title="\nCourses Overview")
-            table.add_column("Code", style="cyan")
-            table.add_column("Title")
-            table.add_column("Semester")
-            table.add_column("Items", justify="right")
-
-            for course in courses:
-                code, title, sem, assign_count, _ = course
-                table.add_row(code, title, sem, str(assign_count))
+        with paged_output(pager):
+            if detailed:
+                # Create detailed view with grade breakdowns
+                for course in courses:
+                    course_id, code, title, sem, credits, assign_count, cat_count, overall = course
+
+                    panel = Panel(
+                        Group(
+                            Text(f"[bold blue]{code}:[/bold blue] {title}"),
+                            Text(f"[cyan]Semester:[/cyan] {sem}"),
+                            Text(f"[magenta]Credits:[/magenta] {credits}"),
+                            Text(f"[green]Categories:[/green] {cat_count}"),
+                            Text(f"[yellow]Assignments:[/yellow] {assign_count}"),
+                        ),
+                        title=f"Course Details"
+                    )
+                    console.print(panel)
+
+                    if assign_count > 0:
+                        if overall is None:
+                            console.print("[yellow]Could not calculate grades: Category weights do not sum to 100%[/yellow]\n")
+                            continue
+
+                        try:
+                            breakdown = gradebook.gradebook.get_grade_breakdown(course_id)
+                            table = create_styled_table(title="\nGrade Breakdown")
+                            table.add_column("Category", style="cyan")
+                            table.add_column("Weight", justify="right")
+                            table.add_column("Grade", justify="right", style="green")
+
+                            for cat in breakdown['categories']:
+                                table.add_row(
+                                    cat['name'],
+                                    f"{cat['weight'] * 100:.1f}%",
+                                    f"{cat['grade']:.1f}%"
+                                )
+
+                            console.print(table)
+                            console.print(
+                                f"\nOverall Grade: [bold magenta]{overall:.1f}%[/bold magenta]\n")
+                        except Exception as e:
+                            console.print(f"[yellow]Could not calculate grades: {str(e)}[/yellow]\n")
+            else:
+                # Create simple table view
+                table = create_styled_table(title="\nCourses Overview")
+                table.add_column("Code", style="cyan")
+                table.add_column("Title")
+                table.add_column("Semester")
+                table.add_column("Items", justify="right")
+                table.add_column("Grade", justify="right", style="magenta")
+
+                for course in courses:
+                    _, code, title, sem, _, assign_count, _, overall = course
+                    grade = f"{overall:.1f}%" if overall is not None and assign_count > 0 else "N/A"
+                    table.add_row(code, title, sem, str(assign_count), grade)
 
-            console.print(table)
+                console.print(table)
 
     except Exception as e:
         console.print(f"[red]Error listing courses:[/red] {str(e)}")
@@ -1164,99 +1328,118 @@ def view_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
 @view.command('details')
 @click.argument('course_code')
 @click.option('--semester', help="Specify semester if course exists in multiple semesters")
+@click.option('--limit', type=click.IntRange(min=0), default=5, help="Recent assignments to show (default: 5)")
+@click.option('--offset', type=click.IntRange(min=0), default=0, help="Skip this many recent assignments first")
+@click.option('--pager', is_flag=True, help="Page the output through the system pager")
 @click.pass_obj
-def view_course_details(gradebook: GradeBookCLI, course_code: str, semester: str):
+def view_course_details(gradebook: GradeBookCLI, course_code: str, semester: str,
+                        limit: int, offset: int, pager: bool):
     """Display comprehensive course summary including all grades and statistics."""
     try:
         course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
         summary = gradebook.gradebook.get_course_summary(course_id)
 
-        # Create header with course info
-        header = Panel(
-            f"[bold blue]{summary['course_code']}:[/bold blue] {summary['course_title']}\n"
-            f"[cyan]Semester:[/cyan] {summary['semester']}\n"
-            f"[green]Overall Grade:[/green] {summary['final_grade']:.2f}%",
-            title="Course Summary"
-        )
-        console.print(header)
-
-        # Show category breakdown
-        table = create_styled_table(title="\nCategory Details")
-        table.add_column("Category", style="cyan")
-        table.add_column("Weight", justify="right")
-        table.add_column("Raw Score", justify="right", style="magenta")
-        table.add_column("Weighted", justify="right", style="green")
-
-        category_averages = {}
-        for assignment in summary['assignments']:
-            title, max_points, earned, date, category, weight, weighted = assignment
-            if category not in category_averages:
-                category_averages[category] = {'earned': 0, 'max': 0, 'weight': weight}
-            cat = category_averages[category]
-            cat['earned'] += earned
-            cat['max'] += max_points
-
-        for category, weight in summary['categories']:
-            if category in category_averages:
-                cat = category_averages[category]
-                avg = (cat['earned'] / cat['max']) * 100
-                weighted = avg * cat['weight']
-                table.add_row(
-                    category,
-                    f"{cat['weight'] * 100:.1f}%",
-                    f"{avg:.1f}%",
-                    f"{weighted:.1f}%"
-                )
-            else:
-                table.add_row(category, f"{weight * 100:.1f}%", "N/A", "N/A")
-
-        console.print("\n", table)
+        with paged_output(pager):
+            # Create header with course info
+            header = Panel(
+                f"[bold blue]{summary['course_code']}:[/bold blue] {summary['course_title']}\n"
+                f"[cyan]Semester:[/cyan] {summary['semester']}\n"
+                f"[green]Overall Grade:[/green] {summary['final_grade']:.2f}%",
+                title="Course Summary"
+            )
+            console.print(header)
 
-        # Show recent assignments
-        if summary['assignments']:
-            table = create_styled_table(title="\nRecent Assignments")
-            table.add_column("Date", style="dim")
+            # Show category breakdown
+            table = create_styled_table(title="\nCategory Details")
             table.add_column("Category", style="cyan")
-            table.add_column("Assignment")
-            table.add_column("Score", justify="right")
-            table.add_column("Grade", justify="right")
+            table.add_column("Weight", justify="right")
+            table.add_column("Raw Score", justify="right", style="magenta")
+            table.add_column("Weighted", justify="right", style="green")
 
-            for assignment in sorted(summary['assignments'], key=lambda x: x[3], reverse=True)[:5]:
-                title, max_points, earned, date, category, weight, weighted = assignment
-                percentage = (earned / max_points) * 100
-                date_str = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
+            # Category averages come from a window over the same rows that
+            # feed the statistics panel below
+            cursor = gradebook.gradebook.cursor
+            cursor.execute("""
+                SELECT 
+                    cat.category_id,
+                    cat.category_name,
+                    cat.weight,
+                    SUM(a.earned_points) OVER category * 100.0
+                        / SUM(a.max_points) OVER category as category_avg,
+                    a.earned_points * 100.0 / a.max_points as grade
+                FROM categories cat
+                LEFT JOIN assignments a ON cat.category_id = a.category_id
+                WHERE cat.course_id = ?
+                WINDOW category AS (PARTITION BY cat.category_id)
+                ORDER BY cat.category_name
+            """, (course_id,))
 
-                # Color code the percentage
-                if percentage >= 90:
-                    grade_str = f"[green]{percentage:.1f}%[/green]"
-                elif percentage >= 80:
-                    grade_str = f"[blue]{percentage:.1f}%[/blue]"
-                elif percentage >= 70:
-                    grade_str = f"[yellow]{percentage:.1f}%[/yellow]"
+            grades = []
+            current = None
+            for category_id, category, weight, avg, grade in cursor:
+                if grade is not None:
+                    grades.append(grade)
+                if category_id == current:
+                    continue
+                current = category_id
+
+                if avg is not None:
+                    table.add_row(
+                        category,
+                        f"{weight * 100:.1f}%",
+                        f"{avg:.1f}%",
+                        f"{avg * weight:.1f}%"
+                    )
                 else:
-                    grade_str = f"[red]{percentage:.1f}%[/red]"
-
-                table.add_row(
-                    date_str,
-                    category,
-                    title,
-                    f"{earned}/{max_points}",
-                    grade_str
-                )
+                    table.add_row(category, f"{weight * 100:.1f}%", "N/A", "N/A")
 
             console.print("\n", table)
 
-        # Show grade statistics
-        if summary['assignments']:
-            grades = [(a[2] / a[1]) * 100 for a in summary['assignments']]
-            stats = f"""
+            # Show recent assignments
+            if summary['assignments']:
+                table = create_styled_table(title="\nRecent Assignments")
+                table.add_column("Date", style="dim")
+                table.add_column("Category", style="cyan")
+                table.add_column("Assignment")
+                table.add_column("Score", justify="right")
+                table.add_column("Grade", justify="right")
+
+                recent = heapq.nlargest(offset + limit, summary['assignments'], key=itemgetter(3))[offset:]
+                for assignment in recent:
+                    title, max_points, earned, date, category, weight, weighted = assignment
+                    percentage = (earned / max_points) * 100
+                    date_str = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
+
+                    # Color code the percentage
+                    if percentage >= 90:
+                        grade_str = f"[green]{percentage:.1f}%[/green]"
+                    elif percentage >= 80:
+                        grade_str = f"[blue]{percentage:.1f}%[/blue]"
+                    elif percentage >= 70:
+                        grade_str = f"[yellow]{percentage:.1f}%[/yellow]"
+                    else:
+                        grade_str = f"[red]{percentage:.1f}%[/red]"
+
+                    table.add_row(
+                        date_str,
+                        category,
+                        title,
+                        f"{earned}/{max_points}",
+                        grade_str
+                    )
+
+                console.print("\n", table)
+
+            # Show grade statistics
+            if grades:
+                stats = f"""
 [bold]Grade Statistics:[/bold]
 Highest Grade: {max(grades):.1f}%
 Lowest Grade: {min(grades):.1f}%
 Average Grade: {sum(grades) / len(grades):.1f}%
 Total Assignments: {len(grades)}
 """
-            console.print(Panel(stats, title="Statistics"))
+                console.print(Panel(stats, title="Statistics"))
 
     except Exception as e:
         console.print(f"[red]Error displaying course details:[/red] {str(e)}")
@@ -1267,12 +1450,11 @@ Total Assignments: {len(grades)}
 @click.pass_obj
 def view_trends(gradebook: GradeBookCLI, course_code: str, days: int):
     """Show grade trends over time for a course."""
+    from rich.layout import Layout
+
     try:
         cursor = gradebook.gradebook.cursor
-        course_id = gradebook.gradebook.get_course_id_by_code(course_code)
-
-        cursor.execute("SELECT course_title FROM courses WHERE course_id = ?", (course_id,))
-        course_title = cursor.fetchone()[0]
+        course_id, course_title, _ = gradebook.gradebook.get_course_info(course_code)
 
         cursor.execute("""
             SELECT a.title, a.earned_points, a.max_points, a.entry_date,
@@ -1288,15 +1470,20 @@ def view_trends(gradebook: GradeBookCLI, course_code: str, days: int):
             console.print("[yellow]No assignments found for this course.[/yellow]")
             return
 
+        max_height = 15
+        scale = max_height / 100
         dates = []
         grades = []
-        running_grade = 0
+        normalized_grades = []
+        running_sum = 0.0
 
+        # One pass yields the raw scores, their bar heights and the running total
         for title, earned, max_points, date, category, weight in assignments:
             score = (earned / max_points) * 100
             dates.append(date)
             grades.append(score)
-            running_grade = statistics.mean(grades)
+            normalized_grades.append(int(score * scale))
+            running_sum += score
 
         layout = Layout()
         layout.split_column(
@@ -1310,27 +1497,18 @@ def view_trends(gradebook: GradeBookCLI, course_code: str, days: int):
             style="white on blue"
         ))
 
-        max_width = 60
-        max_height = 15
-        normalized_grades = [int((g / 100) * max_height) for g in grades]
-
-        graph = ""
-        for y in range(max_height, -1, -1):
-            line = ""
-            for grade in normalized_grades:
-                if grade >= y:
-                    line += "█"
-                else:
-                    line += " "
-            graph += f"{100 * y / max_height:>3.0f}% |{line}\n"
-
-        graph += "     " + "-" * len(grades) + "\n"
-        graph += "     " + "Assignments Over Time"
+        lines = [
+            f"{100 * y / max_height:>3.0f}% |" + "".join("█" if grade >= y else " " for grade in normalized_grades)
+            for y in range(max_height, -1, -1)
+        ]
+        lines.append("     " + "-" * len(grades))
+        lines.append("     " + "Assignments Over Time")
+        graph = "\n".join(lines)
 
         layout["graph"].update(Panel(graph, title="Grade History"))
 
         stats = f"""[green]Latest Grade:[/green] {grades[-1]:.1f}%
-[cyan]Average Grade:[/cyan] {statistics.mean(grades):.1f}%
+[cyan]Average Grade:[/cyan] {running_sum / len(grades):.1f}%
 [magenta]Highest Grade:[/magenta] {max(grades):.1f}%
 [yellow]Lowest Grade:[/yellow] {min(grades):.1f}%
 [blue]Number of Assignments:[/blue] {len(grades)}"""
@@ -1349,19 +1527,30 @@ def view_distribution(gradebook: GradeBookCLI, course_code: str):
     """Show grade distribution for a course."""
     try:
         cursor = gradebook.gradebook.cursor
-        course_id = gradebook.gradebook.get_course_id_by_code(course_code)
-
-        cursor.execute("SELECT course_title FROM courses WHERE course_id = ?", (course_id,))
-        course_title = cursor.fetchone()[0]
+        course_id, course_title, _ = gradebook.gradebook.get_course_info(course_code)
 
+        # Let SQLite bucket the grades; only one row per letter comes back
         cursor.execute("""
-            SELECT (a.earned_points / a.max_points * 100) as percentage
-            FROM assignments a
-            WHERE a.course_id = ?
+            SELECT 
+                CASE 
+                    WHEN percentage >= 90 THEN 'A (90-100)'
+                    WHEN percentage >= 80 THEN 'B (80-89)'
+                    WHEN percentage >= 70 THEN 'C (70-79)'
+                    WHEN percentage >= 60 THEN 'D (60-69)'
+                    ELSE 'F (0-59)'
+                END as bucket,
+                COUNT(*) as count,
+                SUM(COUNT(*)) OVER () as total
+            FROM (
+                SELECT a.earned_points * 100.0 / a.max_points as percentage
+                FROM assignments a
+                WHERE a.course_id = ? AND a.max_points > 0
+            )
+            GROUP BY bucket
         """, (course_id,))
-        grades = [row[0] for row in cursor.fetchall()]
+        rows = cursor.fetchall()
 
-        if not grades:
+        if not rows:
             console.print("[yellow]No grades found for this course.[/yellow]")
             return
 
@@ -1372,31 +1561,20 @@ def view_distribution(gradebook: GradeBookCLI, course_code: str):
             'D (60-69)': 0,
             'F (0-59)': 0
         }
+        total = rows[0][2]
+        for bucket, count, _ in rows:
+            buckets[bucket] = count
 
-        for grade in grades:
-            if grade >= 90:
-                buckets['A (90-100)'] += 1
-            elif grade >= 80:
-                buckets['B (80-89)'] += 1
-            elif grade >= 70:
-                buckets['C (70-79)'] += 1
-            elif grade >= 60:
-                buckets['D (60-69)'] += 1
-            else:
-                buckets['F (0-59)'] += 1
-
-        max_count = max(buckets.values()) if buckets.values() else 0
+        # rows is non-empty here, so at least one bucket has a count
+        max_count = max(buckets.values())
         bar_width = 40
 
-        table = create_styled_table(title=f"\n{course_title} Grade Distribution")
-        table.add_column("Grade Range")
-        table.add_column("Count")
-        table.add_column("Distribution")
+        table = create_styled_table(title=f"\n{course_title} Grade Distribution",
+                                    columns=DISTRIBUTION_COLUMNS)
 
         for grade_range, count in buckets.items():
-            bar_length = int((count / max_count) * bar_width) if max_count > 0 else 0
-            bar = "█" * bar_length
-            percentage = (count / len(grades)) * 100 if grades else 0
+            bar = "█" * int((count / max_count) * bar_width)
+            percentage = (count / total) * 100
             table.add_row(
                 grade_range,
                 f"{count} ({percentage:.1f}%)",
@@ -1417,28 +1595,25 @@ def view_summary(gradebook: GradeBookCLI, semester: str = None):
     try:
         cursor = gradebook.gradebook.cursor
 
-        # Get courses with assignment counts
-        query = """
-            SELECT 
-                c.course_id,
-                c.course_code, 
-                c.course_title, 
+        # Counts and grades for every course in one query; the semester
+        # summaries below are folded from the same rows
+        query = COURSE_TOTALS_CTE + """
+            SELECT
+                c.course_code,
+                c.course_title,
                 c.semester,
-                COUNT(DISTINCT a.assignment_id) as assignment_count,
-                EXISTS (
-                    SELECT 1 
-                    FROM categories cat 
-                    WHERE cat.course_id = c.course_id
-                ) as has_categories
+                COALESCE(t.assignment_count, 0) as assignment_count,
+                COALESCE(t.category_count, 0) > 0 as has_categories,
+                t.overall_grade
             FROM courses c
-            LEFT JOIN assignments a ON c.course_id = a.course_id
+            LEFT JOIN course_totals t ON c.course_id = t.course_id
         """
         params = []
         if semester:
             query += " WHERE c.semester = ?"
             params.append(semester)
 
-        query += " GROUP BY c.course_id, c.course_title, c.semester ORDER BY c.semester DESC, c.course_title"
+        query += " ORDER BY c.semester DESC, c.course_title"
 
         cursor.execute(query, params)
         results = cursor.fetchall()
@@ -1447,34 +1622,31 @@ def view_summary(gradebook: GradeBookCLI, semester: str = None):
             console.print("[yellow]No courses found.[/yellow]")
             return
 
-        table = create_styled_table(title="\nCourse Summary")
-        table.add_column("Course", style="cyan")
-        table.add_column("Title", style="green")
-        table.add_column("Semester")
-        table.add_column("Assignments", justify="right")
-        table.add_column("Overall Grade", justify="right", style="magenta")
+        table = create_styled_table(title="\nCourse Summary", columns=SUMMARY_COLUMNS)
 
-        for course_id, code, title, sem, count, has_categories in results:
-            # Calculate the weighted grade for each course
-            overall_grade = "N/A"
+        semester_stats = {}
+        for code, title, sem, count, has_categories, grade in results:
+            stats = semester_stats.setdefault(sem, [0, 0])
+            stats[0] += 1
+            stats[1] += count
 
-            try:
-                if count > 0 and has_categories:  # Only calculate if there are assignments and categories
-                    grade = gradebook.gradebook.calculate_course_grade(course_id)
-                    if grade is not None:  # Make sure we got a valid grade back
-                        overall_grade = f"{grade:.1f}%"
-                        # Color code the grade
-                        if grade >= 90:
-                            overall_grade = f"[green]{overall_grade}[/green]"
-                        elif grade >= 80:
-                            overall_grade = f"[blue]{overall_grade}[/blue]"
-                        elif grade >= 70:
-                            overall_grade = f"[yellow]{overall_grade}[/yellow]"
-                        else:
-                            overall_grade = f"[red]{overall_grade}[/red]"
-            except Exception as e:
-                console.print(f"[dim red]Warning: Could not calculate grade for {code}: {str(e)}[/dim red]")
-                overall_grade = "[red]Error[/red]"
+            overall_grade = "N/A"
+            if count > 0 and has_categories:  # Only grade courses with assignments and categories
+                if grade is None:
+                    console.print(f"[dim red]Warning: Could not calculate grade for {code}: "
+                                  f"Category weights do not sum to 100%[/dim red]")
+                    overall_grade = "[red]Error[/red]"
+                else:
+                    overall_grade = f"{grade:.1f}%"
+                    # Color code the grade
+                    if grade >= 90:
+                        overall_grade = f"[green]{overall_grade}[/green]"
+                    elif grade >= 80:
+                        overall_grade = f"[blue]{overall_grade}[/blue]"
+                    elif grade >= 70:
+                        overall_grade = f"[yellow]{overall_grade}[/yellow]"
+                    else:
+                        overall_grade = f"[red]{overall_grade}[/red]"
 
             table.add_row(
                 code,
@@ -1486,30 +1658,14 @@ def view_summary(gradebook: GradeBookCLI, semester: str = None):
 
         console.print(table)
 
-        # Show semester summaries if not filtered
-        if not semester:
-            cursor.execute("""
-                SELECT 
-                    c.semester,
-                    COUNT(DISTINCT c.course_id) as course_count,
-                    COUNT(DISTINCT a.assignment_id) as total_assignments
-                FROM courses c
-                LEFT JOIN assignments a ON c.course_id = a.course_id
-                GROUP BY c.semester
-                ORDER BY c.semester DESC
-            """)
-            semester_stats = cursor.fetchall()
-
-            if len(semester_stats) > 1:  # Only show if there's more than one semester
-                table = create_styled_table(title="\nSemester Summaries")
-                table.add_column("Semester", style="cyan")
-                table.add_column("Courses", justify="right")
-                table.add_column("Total Assignments", justify="right")
+        # Show semester summaries if not filtered and there's more than one semester
+        if not semester and len(semester_stats) > 1:
+            table = create_styled_table(title="\nSemester Summaries", columns=SEMESTER_SUMMARY_COLUMNS)
 
-                for sem, course_count, assignment_count in semester_stats:
-                    table.add_row(sem, str(course_count), str(assignment_count))
+            for sem, (course_count, assignment_count) in semester_stats.items():
+                table.add_row(sem, str(course_count), str(assignment_count))
 
-                console.print("\n", table)
+            console.print("\n", table)
 
     except Exception as e:
         console.print(f"[red]Error displaying summary:[/red] {str(e)}")
@@ -1581,13 +1737,12 @@ def move_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
         new_category_id = result[0]
 
         # Move the assignment
-        cursor.execute("""
-            UPDATE assignments 
-            SET category_id = ? 
-            WHERE assignment_id = ?
-        """, (new_category_id, assignment_id))
-
-        gradebook.gradebook.conn.commit()
+        with gradebook.gradebook.conn:
+            cursor.execute("""
+                UPDATE assignments 
+                SET category_id = ? 
+                WHERE assignment_id = ?
+            """, (new_category_id, assignment_id))
 
         percentage = (earned_points / max_points) * 100
         console.print(f"[green]Successfully moved assignment:[/green]")
@@ -1669,8 +1824,9 @@ def edit_course(gradebook: GradeBookCLI, course_code: str, new_code: str,
 
         # Perform update
         query = f"UPDATE courses SET {', '.join(updates)} WHERE course_id = ?"
-        cursor.execute(query, params)
-        gradebook.gradebook.conn.commit()
+        with gradebook.gradebook.conn:
+            cursor.execute(query, params)
+        gradebook.gradebook.clear_course_cache()
 
         # Show before/after comparison
         table = Table(title="Course Updated", box=box.ROUNDED)
@@ -1698,7 +1854,6 @@ def edit_course(gradebook: GradeBookCLI, course_code: str, new_code: str,
         console.print(table)
 
     except Exception as e:
-        gradebook.gradebook.conn.rollback()
         console.print(f"[red]Error editing course:[/red] {str(e)}")
 
 
@@ -1722,7 +1877,8 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
     try:
         cursor = gradebook.gradebook.cursor
 
-        # First get the current assignment details
+        # First get the current assignment details, along with the target
+        # category when --category is given
         cursor.execute("""
             SELECT 
                 a.assignment_id,
@@ -1731,19 +1887,24 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
                 a.max_points,
                 c.category_name,
                 c.category_id,
-                co.course_id
+                c.weight,
+                co.course_id,
+                newc.category_id
             FROM assignments a
             JOIN categories c ON a.category_id = c.category_id
             JOIN courses co ON a.course_id = co.course_id
+            LEFT JOIN categories newc
+                ON newc.course_id = co.course_id AND newc.category_name = ?
             WHERE co.course_code = ? AND a.title = ?
-        """, (course_code, assignment_title))
+        """, (category or '', course_code, assignment_title))
 
         result = cursor.fetchone()
         if not result:
             console.print(f"[red]Assignment '{assignment_title}' not found in {course_code}[/red]")
             return
 
-        assignment_id, curr_title, curr_earned, curr_max, curr_category, curr_category_id, course_id = result
+        (assignment_id, curr_title, curr_earned, curr_max,
+         curr_category, curr_category_id, curr_weight, course_id, new_category_id) = result
 
         # Build update query based on provided options
         updates = []
@@ -1753,34 +1914,17 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
             updates.append("title = ?")
             params.append(new_title)
 
+        # Point limits are enforced by the assignments table's CHECK constraints
         if earned is not None:
-            if earned > (max if max is not None else curr_max):
-                console.print("[red]Error: Earned points cannot exceed maximum points[/red]")
-                return
             updates.append("earned_points = ?")
             params.append(earned)
 
         if max is not None:
-            if max < (earned if earned is not None else curr_earned):
-                console.print("[red]Error: Maximum points cannot be less than earned points[/red]")
-                return
-            if max <= 0:
-                console.print("[red]Error: Maximum points must be greater than 0[/red]")
-                return
             updates.append("max_points = ?")
             params.append(max)
 
-        new_category_id = None
         if category:
-            # Verify new category exists
-            cursor.execute("""
-                SELECT category_id 
-                FROM categories 
-                WHERE course_id = ? AND category_name = ?
-            """, (course_id, category))
-
-            result = cursor.fetchone()
-            if not result:
+            if new_category_id is None:
                 console.print(f"[red]Category '{category}' not found[/red]")
                 # Show available categories
                 cursor.execute("""
@@ -1796,7 +1940,6 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
                         console.print(f"- {name} ({weight * 100:.1f}%)")
                 return
 
-            new_category_id = result[0]
             updates.append("category_id = ?")
             params.append(new_category_id)
 
@@ -1808,28 +1951,38 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
         params.append(assignment_id)
 
         # Perform update
-        cursor.execute(f"""
-            UPDATE assignments 
-            SET {', '.join(updates)}
-            WHERE assignment_id = ?
-        """, params)
+        try:
+            with gradebook.gradebook.conn:
+                cursor.execute(f"""
+                    UPDATE assignments 
+                    SET {', '.join(updates)}
+                    WHERE assignment_id = ?
+                """, params)
+        except sqlite3.IntegrityError as e:
+            console.print(f"[red]Error: {integrity_message(e)}[/red]")
+            return
 
-        gradebook.gradebook.conn.commit()
+        # A title-only edit leaves every score and the course grade as they were
+        needs_regrade = earned is not None or max is not None or category is not None
 
-        # Show updated assignment details
-        cursor.execute("""
-            SELECT 
-                a.title,
-                a.earned_points,
-                a.max_points,
-                c.category_name,
-                c.weight
-            FROM assignments a
-            JOIN categories c ON a.category_id = c.category_id
-            WHERE a.assignment_id = ?
-        """, (assignment_id,))
+        if needs_regrade:
+            # Show updated assignment details
+            cursor.execute("""
+                SELECT 
+                    a.title,
+                    a.earned_points,
+                    a.max_points,
+                    c.category_name,
+                    c.weight
+                FROM assignments a
+                JOIN categories c ON a.category_id = c.category_id
+                WHERE a.assignment_id = ?
+            """, (assignment_id,))
+
+            new_title, new_earned, new_max, new_category, category_weight = cursor.fetchone()
+        else:
+            new_earned, new_max, new_category, category_weight = curr_earned, curr_max, curr_category, curr_weight
 
-        new_title, new_earned, new_max, new_category, category_weight = cursor.fetchone()
         percentage = (new_earned / new_max) * 100
         weighted_score = percentage * category_weight
 
@@ -1856,12 +2009,12 @@ def edit_assignment(gradebook: GradeBookCLI, course_code: str, assignment_title:
         console.print(f"\nUpdated Score: [bold]{new_earned}/{new_max}[/bold] ([green]{percentage:.1f}%[/green])")
         console.print(f"Weighted Score: [magenta]{weighted_score:.1f}%[/magenta]")
 
-        # Show new course grade
-        overall_grade = gradebook.gradebook.calculate_course_grade(course_id)
-        console.print(f"Updated Course Grade: [bold magenta]{overall_grade:.1f}%[/bold magenta]")
+        if needs_regrade:
+            # Show new course grade
+            overall_grade = gradebook.gradebook.calculate_course_grade(course_id)
+            console.print(f"Updated Course Grade: [bold magenta]{overall_grade:.1f}%[/bold magenta]")
 
     except Exception as e:
-        gradebook.gradebook.conn.rollback()
         console.print(f"[red]Error editing assignment:[/red] {str(e)}")
 
 
@@ -1907,121 +2060,111 @@ def edit_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
             updates.append("category_name = ?")
             params.append(new_name)
 
-        if weight is not None:
-            if category_name.lower() == "unallocated":
-                console.print("[red]Error: Cannot modify weight of Unallocated category[/red]")
-                return
-
-            if weight <= 0:
-                console.print("[red]Error: Weight must be greater than 0[/red]")
-                return
-
-            weight_difference = curr_weight - weight
+        # Unallocated row whose new weight is folded into the target UPDATE
+        unallocated_update = None
 
-            if weight_difference < 0:  # Need more weight
-                # Look for Unallocated category
-                cursor.execute("""
-                    SELECT category_id, weight 
-                    FROM categories 
-                    WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-                """, (course_id,))
-                unallocated = cursor.fetchone()
-
-                if not unallocated:
-                    console.print(
-                        "[red]Error: Cannot increase weight without an Unallocated category to draw from[/red]")
+        with gradebook.gradebook.conn:
+            if weight is not None:
+                if category_name.lower() == "unallocated":
+                    console.print("[red]Error: Cannot modify weight of Unallocated category[/red]")
                     return
 
-                unallocated_id, unallocated_weight = unallocated
-                if abs(weight_difference) > unallocated_weight:
-                    console.print(
-                        f"[red]Error: Not enough weight available in Unallocated category (has {unallocated_weight * 100:.1f}%)[/red]")
+                if weight <= 0:
+                    console.print("[red]Error: Weight must be greater than 0[/red]")
                     return
 
-                # Update Unallocated weight
-                new_unallocated_weight = unallocated_weight + weight_difference
-                if new_unallocated_weight > 0.0001:  # Keep if there's meaningful weight left
-                    cursor.execute("""
-                        UPDATE categories 
-                        SET weight = ?
-                        WHERE category_id = ?
-                    """, (new_unallocated_weight, unallocated_id))
-                else:  # Remove if effectively zero
-                    cursor.execute("""
-                        DELETE FROM categories 
-                        WHERE category_id = ?
-                    """, (unallocated_id,))
+                weight_difference = curr_weight - weight
 
-            elif weight_difference > 0:  # Reducing weight
-                # Check if Unallocated category exists
-                cursor.execute("""
-                    SELECT category_id, weight 
-                    FROM categories 
-                    WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-                """, (course_id,))
-                unallocated = cursor.fetchone()
-
-                if unallocated:
-                    # Add to existing Unallocated category
-                    unallocated_id, unallocated_weight = unallocated
-                    new_unallocated_weight = unallocated_weight + weight_difference
-                    cursor.execute("""
-                        UPDATE categories 
-                        SET weight = ?
-                        WHERE category_id = ?
-                    """, (new_unallocated_weight, unallocated_id))
-                else:
-                    # Create new Unallocated category
-                    cursor.execute("""
-                        INSERT INTO categories (course_id, category_name, weight)
-                        VALUES (?, 'Unallocated', ?)
-                    """, (course_id, weight_difference))
+                if weight_difference != 0:
+                    cursor.execute(SQL_SELECT_UNALLOCATED, (course_id,))
+                    unallocated = cursor.fetchone()
 
-            updates.append("weight = ?")
-            params.append(weight)
+                if weight_difference < 0:  # Need more weight
+                    if not unallocated:
+                        console.print(
+                            "[red]Error: Cannot increase weight without an Unallocated category to draw from[/red]")
+                        return
 
-        if not updates:
-            console.print("[yellow]No changes specified. Use --help to see available options.[/yellow]")
-            return
+                    unallocated_id, unallocated_weight = unallocated
+                    if abs(weight_difference) > unallocated_weight:
+                        console.print(
+                            f"[red]Error: Not enough weight available in Unallocated category (has {unallocated_weight * 100:.1f}%)[/red]")
+                        return
 
-        params.append(category_id)
+                    new_unallocated_weight = unallocated_weight + weight_difference
+                    if new_unallocated_weight > 0.0001:  # Keep if there's meaningful weight left
+                        unallocated_update = (unallocated_id, new_unallocated_weight)
+                    else:  # Remove if effectively zero
+                        cursor.execute("""
+                            DELETE FROM categories 
+                            WHERE category_id = ?
+                        """, (unallocated_id,))
+
+                elif weight_difference > 0:  # Reducing weight
+                    if unallocated:
+                        # Add to existing Unallocated category
+                        unallocated_id, unallocated_weight = unallocated
+                        unallocated_update = (unallocated_id, unallocated_weight + weight_difference)
+                    else:
+                        # Create new Unallocated category
+                        cursor.execute(SQL_INSERT_CATEGORY, (course_id, 'Unallocated', weight_difference))
+
+                updates.append("weight = ?")
+                params.append(weight)
+
+            if not updates:
+                console.print("[yellow]No changes specified. Use --help to see available options.[/yellow]")
+                return
 
-        cursor.execute(f"""
-            UPDATE categories 
-            SET {', '.join(updates)}
-            WHERE category_id = ?
-        """, params)
+            if unallocated_update:
+                # Move weight between the target and Unallocated in one statement
+                unallocated_id, new_unallocated_weight = unallocated_update
+                updates = ["weight = CASE category_id WHEN ? THEN ? ELSE ? END"]
+                params = [category_id, weight, new_unallocated_weight]
+                if new_name:
+                    updates.append("category_name = CASE category_id WHEN ? THEN ? ELSE category_name END")
+                    params.extend([category_id, new_name])
+                params.extend([category_id, unallocated_id])
+                where = "category_id IN (?, ?)"
+            else:
+                params.append(category_id)
+                where = "category_id = ?"
 
-        gradebook.gradebook.conn.commit()
+            cursor.execute(f"""
+                UPDATE categories 
+                SET {', '.join(updates)}
+                WHERE {where}
+            """, params)
 
-        # Show updated categories
-        cursor.execute("""
-            SELECT category_name, weight
-            FROM categories
-            WHERE course_id = ?
-            ORDER BY 
-                CASE WHEN LOWER(category_name) = 'unallocated' THEN 1 ELSE 0 END,
-                category_name
-        """, (course_id,))
+            # Show updated categories, read back in the same transaction
+            cursor.execute("""
+                SELECT category_name, weight
+                FROM categories
+                WHERE course_id = ?
+                ORDER BY 
+                    CASE WHEN category_name = 'Unallocated' COLLATE NOCASE THEN 1 ELSE 0 END,
+                    category_name
+            """, (course_id,))
 
-        categories = cursor.fetchall()
+            categories = cursor.fetchall()
 
         table = create_styled_table(title="\nUpdated Category Weights")
         table.add_column("Category", style="cyan")
         table.add_column("Weight", justify="right", style="green")
 
         total_weight = 0
+        highlighted = new_name or category_name
         for cat_name, cat_weight in categories:
             total_weight += cat_weight
-            style = "dim" if cat_name.lower() == "unallocated" else None
-            name_cell = f"[{style or ''}]{cat_name}[/{style or ''}]" if style else cat_name
-            weight_cell = f"[{style or ''}]{cat_weight * 100:.1f}%[/{style or ''}]" if style else f"{cat_weight * 100:.1f}%"
-
-            if cat_name == (new_name or category_name):  # Highlight changed category
-                name_cell = f"[bold green]{cat_name}[/bold green]"
-                weight_cell = f"[bold green]{cat_weight * 100:.1f}%[/bold green]"
+            if cat_name == highlighted:  # Highlight changed category
+                style = "bold green"
+            elif cat_name.lower() == "unallocated":
+                style = "dim"
+            else:
+                style = ""
 
-            table.add_row(name_cell, weight_cell)
+            # Styled Text cells skip Rich's markup parser
+            table.add_row(Text(cat_name, style=style), Text(f"{cat_weight * 100:.1f}%", style=style))
 
         console.print(table)
 
@@ -2030,7 +2173,6 @@ def edit_category(gradebook: GradeBookCLI, course_code: str, category_name: str,
             console.print(f"[yellow]Warning: Total weights sum to {total_weight * 100:.1f}%[/yellow]")
 
     except Exception as e:
-        gradebook.gradebook.conn.rollback()
         console.print(f"[red]Error editing category:[/red] {str(e)}")
 
 @cli.group()
@@ -2039,102 +2181,134 @@ def export():
     pass
 
 
-def export_course_to_file(gradebook: GradeBookCLI, course_code: str, output_path: Path, format: str):
-    """Internal function to handle course export logic."""
-    cursor = gradebook.gradebook.cursor
+# Course rows for export along with their overall grades, so a bulk export
+# needs no per-course lookup or grade calculation. Courses whose weights do
+# not sum to 100% export a 0.00% grade.
+EXPORT_COURSES_QUERY = COURSE_TOTALS_CTE + """
+    SELECT
+        c.course_id,
+        c.course_code,
+        c.course_title,
+        c.semester,
+        COALESCE(t.overall_grade, 0.0) as overall_grade
+    FROM courses c
+    LEFT JOIN course_totals t ON c.course_id = t.course_id
+"""
 
-    # Get course information
-    cursor.execute("""
-        SELECT c.course_title, c.semester, c.course_id 
-        FROM courses c 
-        WHERE c.course_code = ?
-    """, (course_code,))
-
-    course = cursor.fetchone()
-    if not course:
-        raise ValueError(f"Course '{course_code}' not found!")
-
-    course_title, semester, course_id = course
-
-    # Get categories and assignments
-    cursor.execute("""
-        SELECT 
-            c.category_name,
-            c.weight,
-            a.title,
-            a.max_points,
-            a.earned_points,
-            a.entry_date,
-            CASE 
-                WHEN a.max_points > 0 
-                THEN (a.earned_points / a.max_points * c.weight) 
-                ELSE 0 
-            END as weighted_score
-        FROM categories c
-        LEFT JOIN assignments a ON c.category_id = a.category_id
-        WHERE c.course_id = ?
-        ORDER BY c.category_name, COALESCE(a.title, '')
-    """, (course_id,))
-
-    results = cursor.fetchall()
+# Per-course export detail rows. Module-level so every course in a bulk
+# export reuses the same prepared statement.
+EXPORT_TXT_QUERY = """
+    SELECT 
+        c.category_name,
+        c.weight,
+        a.title,
+        a.max_points,
+        a.earned_points,
+        substr(a.entry_date, 1, 10) as entry_date,
+        AVG(CASE WHEN a.max_points > 0 THEN a.earned_points * 100.0 / a.max_points END)
+            OVER (PARTITION BY c.category_id) as category_average
+    FROM categories c
+    LEFT JOIN assignments a ON c.category_id = a.category_id
+    WHERE c.course_id = ?
+    ORDER BY c.category_name, COALESCE(a.title, '')
+"""
 
-    try:
-        overall_grade = gradebook.gradebook.calculate_course_grade(course_id)
-    except Exception:
-        overall_grade = 0.0
+# Rows already shaped as CSV fields; categories without assignments leave
+# the assignment fields empty
+EXPORT_CSV_QUERY = """
+    SELECT
+        c.category_name,
+        printf('%.2f', c.weight),
+        a.title,
+        a.max_points,
+        a.earned_points,
+        CASE WHEN a.max_points > 0
+            THEN printf('%.1f', a.earned_points * 100.0 / a.max_points)
+        END,
+        substr(a.entry_date, 1, 10)
+    FROM categories c
+    LEFT JOIN assignments a ON c.category_id = a.category_id
+    WHERE c.course_id = ?
+    ORDER BY c.category_name, COALESCE(a.title, '')
+"""
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+def render_course_export(gradebook: GradeBookCLI, course: tuple, format: str) -> str:
+    """Internal function to build a course export's contents.
+
+    course is a row from EXPORT_COURSES_QUERY.
+    """
+    cursor = gradebook.gradebook.cursor
+    course_id, course_code, course_title, semester, overall_grade = course
 
     if format == 'txt':
-        with open(output_path, 'w') as f:
-            # Write header
-            f.write(f"{course_code}: {course_title}\n")
-            f.write(f"Semester: {semester}\n")
-            f.write(f"Overall Grade: {overall_grade:.2f}%\n\n")
-
-            current_category = None
-            category_total = 0.0
-            category_count = 0
-
-            for cat_name, weight, title, max_points, earned_points, date, weighted_score in results:
-                if cat_name != current_category:
-                    if current_category and category_count > 0:
-                        f.write(f"Category Average: {(category_total / category_count):.2f}%\n\n")
-
-                    f.write(f"{cat_name} ({(weight * 100):.2f}%)\n")
-                    f.write("-" * 64 + "\n")
-                    current_category = cat_name
-                    category_total = 0.0
-                    category_count = 0
+        cursor.execute(EXPORT_TXT_QUERY, (course_id,))
+        results = cursor.fetchall()
 
+        # Collect the report as a list of lines and join it once
+        lines = [
+            f"{course_code}: {course_title}\n",
+            f"Semester: {semester}\n",
+            f"Overall Grade: {overall_grade:.2f}%\n\n",
+        ]
+        write = lines.append
+
+        # Rows arrive ordered by category, each carrying its category's average
+        wrote_average = False
+        for cat_name, rows in groupby(results, key=itemgetter(0)):
+            rows = list(rows)
+            weight, category_average = rows[0][1], rows[0][6]
+            if wrote_average:
+                write("\n")
+            write(f"{cat_name} ({(weight * 100):.2f}%)\n")
+            write("-" * 64 + "\n")
+
+            for _, _, title, max_points, earned_points, date, _ in rows:
                 if title:  # If there's an assignment
                     percentage = (earned_points / max_points) * 100
-                    category_total += percentage
-                    category_count += 1
-                    date_str = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                    f.write(f"{title:<30} {earned_points:>5.1f}/{max_points:<5.1f} ")
-                    f.write(f"({percentage:>5.1f}%) [{date_str}]\n")
+                    write(f"{title:<30} {earned_points:>5.1f}/{max_points:<5.1f} "
+                          f"({percentage:>5.1f}%) [{date}]\n")
 
-            if category_count > 0:
-                f.write(f"Category Average: {(category_total / category_count):.2f}%\n")
+            wrote_average = category_average is not None
+            if wrote_average:
+                write(f"Category Average: {category_average:.2f}%\n")
+
+        return "".join(lines)
 
     elif format == 'csv':
-        with open(output_path, 'w') as f:
-            f.write(f"Course,{course_code}\n")
-            f.write(f"Title,{course_title}\n")
-            f.write(f"Semester,{semester}\n")
-            f.write(f"Overall Grade,{overall_grade:.2f}%\n\n")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerows([
+            ["Course", course_code],
+            ["Title", course_title],
+            ["Semester", semester],
+            ["Overall Grade", f"{overall_grade:.2f}%"],
+            [],
+            ["Category", "Weight", "Assignment", "Max Points", "Earned Points", "Percentage", "Date"],
+        ])
 
-            f.write("Category,Weight,Assignment,Max Points,Earned Points,Percentage,Date\n")
+        # Rows come back already shaped as CSV fields and go straight to the writer
+        cursor.execute(EXPORT_CSV_QUERY, (course_id,))
+        writer.writerows(cursor)
+        return buffer.getvalue()
+
+    raise ValueError(f"Unsupported export format '{format}'")
 
-            for cat_name, weight, title, max_points, earned_points, date, _ in results:
-                if title:
-                    percentage = (earned_points / max_points) * 100
-                    date_str = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                    f.write(f'"{cat_name}",{weight:.2f},"{title}",')
-                    f.write(f"{max_points},{earned_points},{percentage:.1f},{date_str}\n")
-                else:
-                    f.write(f'"{cat_name}",{weight:.2f},,,,\n')
+
+def write_export(output_path: Path, contents: str) -> None:
+    """Write a rendered export; the caller creates its directory."""
+    output_path.write_text(contents, encoding='utf-8')
+
+
+def export_course_to_file(gradebook: GradeBookCLI, course_code: str, output_path: Path, format: str,
+                          semester: str = None):
+    """Internal function to handle course export logic."""
+    course_id = gradebook.gradebook.get_course_id_by_code(course_code, semester)
+    course = gradebook.gradebook.cursor.execute(
+        EXPORT_COURSES_QUERY + " WHERE c.course_id = ?", (course_id,)).fetchone()
+    contents = render_course_export(gradebook, course, format)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_export(output_path, contents)
 
 
 @export.command('course')
@@ -2142,21 +2316,24 @@ def export_course_to_file(gradebook: GradeBookCLI, course_code: str, output_path
 @click.option('--output', '-o', help="Output file path (default: <course_code>.txt)")
 @click.option('--format', '-f', type=click.Choice(['txt', 'csv']), default='txt',
               help="Output format (default: txt)")
+@click.option('--semester', help="Specify semester if course exists in multiple semesters")
 @click.pass_obj
-def export_course(gradebook: GradeBookCLI, course_code: str, output: str, format: str):
+def export_course(gradebook: GradeBookCLI, course_code: str, output: str, format: str,
+                  semester: str = None):
     """Export a single course's data to a file.
 
     Example:
         gradebook export course CHM343
         gradebook export course CHM343 --format csv
         gradebook export course CHM343 -o ~/Desktop/chemistry.txt
+        gradebook export course CHM343 --semester "Fall 2024"
     """
     try:
         if not output:
             output = f"{course_code}.{format}"
         output_path = Path(output).expanduser()
 
-        export_course_to_file(gradebook, course_code, output_path, format)
+        export_course_to_file(gradebook, course_code, output_path, format, semester)
         console.print(f"[green]Successfully exported to:[/green] {output_path}")
 
     except Exception as e:
@@ -2180,34 +2357,47 @@ def export_all(gradebook: GradeBookCLI, output_dir: str, format: str):
     try:
         cursor = gradebook.gradebook.cursor
 
-        # Get all courses
-        cursor.execute("""
-            SELECT course_code, semester
-            FROM courses
-            ORDER BY semester DESC, course_code
-        """)
+        # Get all courses and their grades in one query
+        cursor.execute(EXPORT_COURSES_QUERY + " ORDER BY c.semester DESC, c.course_code")
 
         courses = cursor.fetchall()
         if not courses:
             console.print("[yellow]No courses found to export[/yellow]")
             return
 
-        # Create output directory
+        # Create output directory once; every export file goes straight into it
         output_path = Path(output_dir).expanduser()
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # Reports are rendered here on the shared connection; only the file
+        # writes go to worker threads, overlapping with the next course's queries
         success_count = 0
-        for course_code, semester in courses:
-            try:
+        with ThreadPoolExecutor(max_workers=min(8, len(courses))) as executor:
+            pending = []
+            for course in courses:
+                _, course_code, _, semester, _ = course
+                try:
+                    contents = render_course_export(gradebook, course, format)
+                except Exception as e:
+                    pending.append((course_code, e))
+                    continue
                 file_path = output_path / f"{course_code}_{semester}.{format}"
-                export_course_to_file(gradebook, course_code, file_path, format)
-                success_count += 1
-                console.print(f"[green]Exported {course_code}[/green]")
-            except Exception as e:
-                console.print(f"[red]Error exporting {course_code}:[/red] {str(e)}")
+                pending.append((course_code, executor.submit(write_export, file_path, contents)))
+
+            # Report every course in one print rather than flushing per course
+            report = []
+            for course_code, outcome in pending:
+                # outcome is either the render error or the pending write
+                error = outcome if isinstance(outcome, Exception) else outcome.exception()
+                if error is None:
+                    success_count += 1
+                    report.append(Text.from_markup(f"[green]Exported {course_code}[/green]"))
+                else:
+                    report.append(Text.from_markup(f"[red]Error exporting {course_code}:[/red] ") + Text(str(error)))
 
-        console.print(
-            f"\n[green]Successfully exported {success_count} of {len(courses)} courses to:[/green] {output_path}")
+        report.append(Text.from_markup(
+            f"\n[green]Successfully exported {success_count} of {len(courses)} courses to:[/green] {output_path}"))
+        console.print(Group(*report))
 
     except Exception as e:
         console.print(f"[red]Error exporting courses:[/red] {str(e)}")
@@ -3,15 +3,41 @@
 import sqlite3
 
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 
+# Shared statement text so every caller hits the same prepared-statement cache entry
+SQL_INSERT_CATEGORY = "INSERT INTO categories (course_id, category_name, weight) VALUES (?, ?, ?)"
+SQL_SELECT_UNALLOCATED = (
+    "SELECT category_id, weight FROM categories "
+    "WHERE course_id = ? AND category_name = 'Unallocated' COLLATE NOCASE"
+)
+
 
 class GradeBookError(Exception):
     """Custom exception for Gradebook errors"""
     pass
 
 
+# Friendly messages for the schema's CHECK constraints, keyed by expression text
+CHECK_MESSAGES = {
+    "max_points > 0": "Max points must be greater than 0",
+    "earned_points >= 0": "Earned points cannot be negative",
+    "earned_points <= max_points": "Earned points cannot exceed max points",
+    "weight >= 0 AND weight <= 1": "Weight must be between 0 and 1 (0% to 100%)",
+}
+
+
+def integrity_message(error: sqlite3.IntegrityError) -> str:
+    """Translate a constraint violation into a message fit for the user."""
+    message = str(error)
+    for expression, friendly in CHECK_MESSAGES.items():
+        if message.endswith(expression):
+            return friendly
+    return message
+
+
 class Gradebook:
     def __init__(self, db_path):
         if db_path is None:
@@ -19,26 +45,35 @@ class Gradebook:
 
         db_path.parent.mkdir(parents=True, exist_ok=True)
         self.db_path = db_path
-        self.conn = sqlite3.connect(str(db_path))
+        self.conn = sqlite3.connect(str(db_path), cached_statements=256)
         self.cursor = self.conn.cursor()
         self.cursor.execute("PRAGMA foreign_keys = ON")
 
+        # Per-instance cache behind get_course_id_by_code; anything that adds,
+        # edits or removes a course must call clear_course_cache()
+        self.get_course_info = lru_cache(maxsize=128)(self.get_course_info)
+
         # Always ensure database is properly initialized
         self.ensure_database_initialized()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def verify_database_initialized(self) -> bool:
         """Verify that all required tables exist and have correct schema."""
         try:
             tables = ["courses", "categories", "assignments"]
 
-            for table in tables:
-                self.cursor.execute(f"""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name=?
-                """, (table,))
+            self.cursor.execute(f"""
+                SELECT COUNT(*) FROM sqlite_master 
+                WHERE type='table' AND name IN ({', '.join('?' * len(tables))})
+            """, tables)
 
-                if not self.cursor.fetchone():
-                    return False
+            if self.cursor.fetchone()[0] != len(tables):
+                return False
 
             return True
 
@@ -46,7 +81,11 @@ class Gradebook:
             return False
 
     def ensure_database_initialized(self) -> None:
-        """Ensure database is initialized, creating tables if needed."""
+        """Ensure database is initialized, creating tables if needed.
+
+        An existing database is left untouched; its indexes are brought up
+        to date by migrations/003_add_lookup_indexes.py.
+        """
         if not self.verify_database_initialized():
             self.create_tables()
 
@@ -71,7 +110,7 @@ class Gradebook:
             CREATE TABLE categories (
                 category_id INTEGER PRIMARY KEY AUTOINCREMENT,
                 course_id INTEGER,
-                category_name TEXT NOT NULL,
+                category_name TEXT NOT NULL COLLATE NOCASE,
                 weight REAL NOT NULL CHECK (weight >= 0 AND weight <= 1),
                 FOREIGN KEY (course_id) REFERENCES courses(course_id) 
                     ON DELETE CASCADE
@@ -96,6 +135,27 @@ class Gradebook:
                     ON UPDATE CASCADE
             );
         ''')
+        self.create_indexes()
+        self.clear_course_cache()
+
+    def clear_course_cache(self) -> None:
+        """Forget cached course code lookups after courses change."""
+        self.get_course_info.cache_clear()
+
+    def create_indexes(self):
+        """Create lookup indexes for a freshly created schema."""
+        # (course_code, semester) and (course_id, category_name) lookups are
+        # already served by the indexes behind their UNIQUE constraints.
+        # idx_courses_semester matches the newest-semester-first course
+        # listing used by exports, so it needs no sort step. Keep this in
+        # step with migrations/003_add_lookup_indexes.py
+        self.cursor.executescript('''
+            CREATE INDEX IF NOT EXISTS idx_courses_semester
+                ON courses(semester DESC, course_code);
+            CREATE INDEX IF NOT EXISTS idx_assign_cat ON assignments(category_id);
+            CREATE INDEX IF NOT EXISTS idx_assignments_course
+                ON assignments(course_id, entry_date, category_id);
+        ''')
         self.conn.commit()
 
     def add_course(self, course_code: str, course_title: str, semester: str, credit_hours: int = 3) -> int:
@@ -106,6 +166,7 @@ class Gradebook:
             VALUES (?, ?, ?, ?)
             ''', (course_code.upper(), course_title, semester, credit_hours))
             self.conn.commit()
+            self.clear_course_cache()
             return self.cursor.lastrowid
         except sqlite3.IntegrityError:
             raise GradeBookError(f"Course {course_code} already exists for {semester}")
@@ -135,6 +196,7 @@ class Gradebook:
             params.append(course_id)
             self.cursor.execute(query, tuple(params))
             self.conn.commit()
+            self.clear_course_cache()
 
     def get_all_courses(self) -> List[dict]:
         """Get a list of all courses."""
@@ -187,11 +249,7 @@ class Gradebook:
             )
 
         # First check for Unallocated category specifically
-        self.cursor.execute("""
-            SELECT category_id, weight 
-            FROM categories 
-            WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-        """, (course_id,))
+        self.cursor.execute(SQL_SELECT_UNALLOCATED, (course_id,))
         
         unallocated = self.cursor.fetchone()
         if not unallocated:
@@ -218,36 +276,30 @@ class Gradebook:
 
         # Add the new category
         try:
-            self.cursor.execute('''
-            INSERT INTO categories (course_id, category_name, weight)
-            VALUES (?, ?, ?)
-            ''', (course_id, category_name, weight))
+            self.cursor.execute(SQL_INSERT_CATEGORY, (course_id, category_name, weight))
             self.conn.commit()
             return self.cursor.lastrowid
         except sqlite3.IntegrityError:
             self.conn.rollback()
             raise GradeBookError(f"Category '{category_name}' already exists for this course")
 
-        def add_categories(self, course_id: int, categories: List[Tuple[str, float]]):
-            """Add multiple categories for a course at once."""
-            total_weight = sum(weight for _, weight in categories)
-            tolerance = 0.0001
-
-            if not abs(total_weight - 1.0) <= tolerance:  # Allow exact 100% with tolerance
-                raise GradeBookError(
-                    f"Category weights must sum to 100% (got {total_weight * 100:.2f}%, tolerance: ±{tolerance * 100:.2f}%)"
-                )
-
-            try:
-                for category_name, weight in categories:
-                    self.cursor.execute('''
-                    INSERT INTO categories (course_id, category_name, weight)
-                    VALUES (?, ?, ?)
-                    ''', (course_id, category_name, weight))
-                self.conn.commit()
-            except sqlite3.IntegrityError:
-                self.conn.rollback()
-                raise GradeBookError("Duplicate category names are not allowed")
+    def add_categories(self, course_id: int, categories: List[Tuple[str, float]]):
+        """Add multiple categories for a course at once."""
+        total_weight = sum(weight for _, weight in categories)
+        tolerance = 0.0001
+
+        if not abs(total_weight - 1.0) <= tolerance:  # Allow exact 100% with tolerance
+            raise GradeBookError(
+                f"Category weights must sum to 100% (got {total_weight * 100:.2f}%, tolerance: ±{tolerance * 100:.2f}%)"
+            )
+
+        try:
+            # One statement and one commit for the whole batch
+            self.cursor.executemany(SQL_INSERT_CATEGORY, [(course_id, category_name, weight) for category_name, weight in categories])
+            self.conn.commit()
+        except sqlite3.IntegrityError:
+            self.conn.rollback()
+            raise GradeBookError("Duplicate category names are not allowed")
 
     def ensure_unassigned_category(self, course_id: int) -> int:
         """
@@ -264,10 +316,7 @@ class Gradebook:
             return result[0]
 
         # Create new Unassigned category with 0 weight
-        self.cursor.execute('''
-        INSERT INTO categories (course_id, category_name, weight)
-        VALUES (?, 'Unassigned', 0.0)
-        ''', (course_id,))
+        self.cursor.execute(SQL_INSERT_CATEGORY, (course_id, 'Unassigned', 0.0))
         self.conn.commit()
         return self.cursor.lastrowid
 
@@ -286,11 +335,7 @@ class Gradebook:
 
         if weight_difference > 0:  # Reducing weight, need to create/update Unallocated
             # Check for existing Unallocated category
-            self.cursor.execute('''
-            SELECT category_id, weight 
-            FROM categories 
-            WHERE course_id = ? AND LOWER(category_name) = 'unallocated'
-            ''', (course_id,))
+            self.cursor.execute(SQL_SELECT_UNALLOCATED, (course_id,))
             unallocated = self.cursor.fetchone()
 
             if unallocated:
@@ -301,10 +346,7 @@ class Gradebook:
                 ''', (new_unallocated_weight, unallocated[0]))
             else:
                 # Create new Unallocated category
-                self.cursor.execute('''
-                INSERT INTO categories (course_id, category_name, weight)
-                VALUES (?, 'Unallocated', ?)
-                ''', (course_id, weight_difference))
+                self.cursor.execute(SQL_INSERT_CATEGORY, (course_id, 'Unallocated', weight_difference))
 
         # Update the category weight
         self.cursor.execute('''
@@ -410,6 +452,7 @@ class Gradebook:
         # The ON DELETE CASCADE in the schema will handle the deletions
         self.cursor.execute('DELETE FROM courses WHERE course_id = ?', (course_id,))
         self.conn.commit()
+        self.clear_course_cache()
 
         return course_code, course_title, semester, assignment_count
 
@@ -418,27 +461,34 @@ class Gradebook:
         """Add a new assignment."""
         # Verify category belongs to course
         self.cursor.execute('''
-        SELECT COUNT(*) FROM categories 
+        SELECT 1 FROM categories 
         WHERE category_id = ? AND course_id = ?
+        LIMIT 1
         ''', (category_id, course_id))
-        if self.cursor.fetchone()[0] == 0:
+        if self.cursor.fetchone() is None:
             raise GradeBookError("Category does not belong to this course")
 
         # Check for duplicate assignment
         self.cursor.execute('''
-        SELECT COUNT(*) FROM assignments
+        SELECT 1 FROM assignments
         WHERE course_id = ? AND title = ?
+        LIMIT 1
         ''', (course_id, title))
-        if self.cursor.fetchone()[0] > 0:
+        if self.cursor.fetchone() is not None:
             raise GradeBookError(f"Assignment '{title}' already exists in this course")
 
+        # Point bounds are enforced by the table's CHECK constraints
         entry_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        self.cursor.execute('''
-        INSERT INTO assignments (course_id, category_id, title, max_points, earned_points, entry_date)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (course_id, category_id, title, max_points, earned_points, entry_date))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        try:
+            self.cursor.execute('''
+            INSERT INTO assignments (course_id, category_id, title, max_points, earned_points, entry_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', (course_id, category_id, title, max_points, earned_points, entry_date))
+            self.conn.commit()
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            raise GradeBookError(integrity_message(e))
 
     def calculate_course_grade(self, course_id: int) -> float:
         """Calculate the overall weighted grade for a course, handling extra credit properly."""
@@ -449,7 +499,7 @@ class Gradebook:
         self.cursor.execute('''
             SELECT category_id, category_name, weight
             FROM categories 
-            WHERE course_id = ? AND LOWER(category_name) != 'unallocated'
+            WHERE course_id = ? AND category_name != 'Unallocated' COLLATE NOCASE
             ORDER BY category_name
         ''', (course_id,))
 
@@ -489,7 +539,7 @@ class Gradebook:
                 COUNT(a.assignment_id) as assignment_count
             FROM categories c
             LEFT JOIN assignments a ON c.category_id = a.category_id
-            WHERE c.course_id = ? AND LOWER(c.category_name) != 'unallocated'
+            WHERE c.course_id = ? AND c.category_name != 'Unallocated' COLLATE NOCASE
             GROUP BY c.category_id
             ORDER BY c.category_name
         ''', (course_id,))
@@ -602,29 +652,39 @@ class Gradebook:
 
         return earned, possible
 
-    def get_course_id_by_code(self, course_code: str, semester: str = None) -> int:
-        """Get course ID by course code and optionally semester."""
+    def get_course_info(self, course_code: str, semester: str = None) -> tuple[int, str, str]:
+        """Get (course_id, course_title, semester) by course code and optionally semester."""
         if semester:
             self.cursor.execute('''
-            SELECT course_id FROM courses 
+            SELECT course_id, course_title, semester FROM courses
             WHERE course_code = ? AND semester = ?
+            LIMIT 1
             ''', (course_code.upper(), semester))
         else:
+            # Two rows are enough to tell a unique match from an ambiguous one
             self.cursor.execute('''
-            SELECT course_id, semester FROM courses 
+            SELECT course_id, course_title, semester FROM courses
             WHERE course_code = ?
+            LIMIT 2
             ''', (course_code.upper(),))
 
         rows = self.cursor.fetchall()
         if not rows:
             raise GradeBookError(f"Course '{course_code}' not found")
         if len(rows) > 1:
-            semesters = [row[1] for row in rows]
+            self.cursor.execute('''
+            SELECT semester FROM courses WHERE course_code = ?
+            ''', (course_code.upper(),))
+            semesters = [row[0] for row in self.cursor.fetchall()]
             raise GradeBookError(
                 f"Multiple sections of {course_code} found. "
                 f"Please specify semester. Available: {', '.join(semesters)}"
             )
-        return rows[0][0] if semester else rows[0][0]
+        return rows[0]
+
+    def get_course_id_by_code(self, course_code: str, semester: str = None) -> int:
+        """Get course ID by course code and optionally semester."""
+        return self.get_course_info(course_code, semester)[0]
 
     def get_category_id(self, course_code: str, category_name: str, semester: str = None) -> int:
         """Get category ID by course code and category name."""
@@ -1,6 +1,8 @@
 # tests/test_cli_commands.py
+import click
+import pytest
 from click.testing import CliRunner
-from gradebook.cli import cli, GradeBookCLI
+from gradebook.cli import cli, GradeBookCLI, get_version, parse_category_spec
 from typing import Sequence
 
 from gradebook.db import Gradebook
@@ -38,4 +40,210 @@ def test_view_course_details(runner: CliRunner, test_db: Gradebook, test_db_path
 
     result = runner.invoke(cli, ['--db-path', str(test_db_path), 'view', 'course', 'TEST303'])
     assert result.exit_code == 0
-    assert "Detailed Test" in result.output
\ No newline at end of file
+    assert "Detailed Test" in result.output
+
+
+def test_export_course_with_semester(runner: CliRunner, test_db: Gradebook, test_db_path: str, tmp_path):
+    """Test exporting one section of a course offered in several semesters."""
+    test_db.add_course("TEST304", "Fall Section", "Fall 2024")
+    test_db.add_course("TEST304", "Spring Section", "Spring 2025")
+
+    output = tmp_path / "spring.txt"
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'export', 'course', 'TEST304',
+                                 '--semester', 'Spring 2025', '-o', str(output)])
+    assert result.exit_code == 0
+    assert "Successfully exported" in result.output
+    assert "Spring Section" in output.read_text()
+
+    # Without --semester the ambiguity is reported instead of exporting either section
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'export', 'course', 'TEST304',
+                                 '-o', str(tmp_path / "either.txt")])
+    assert "Multiple sections" in result.output
+    assert not (tmp_path / "either.txt").exists()
+
+
+def test_export_txt_section_spacing(runner: CliRunner, test_db: Gradebook, test_db_path: str, tmp_path):
+    """Test that only sections with an average are followed by a blank line."""
+    course_id = test_db.add_course("TEST305", "Spacing", "Fall 2024")
+    test_db.add_categories(course_id, [("Exams", 0.5), ("Labs", 0.3), ("Quizzes", 0.2)])
+    category_id = test_db.get_category_id("TEST305", "Exams", "Fall 2024")
+    test_db.add_assignment(course_id, category_id, "Category Average Review", 100, 80)
+
+    output = tmp_path / "spacing.txt"
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'export', 'course', 'TEST305',
+                                 '-o', str(output)])
+    assert result.exit_code == 0
+    contents = output.read_text()
+    assert "Category Average: 80.00%\n\nLabs (30.00%)" in contents
+    assert "-" * 64 + "\nQuizzes (20.00%)" in contents
+
+
+def test_version_option(runner: CliRunner):
+    """Test --version works whether or not the package is installed."""
+    result = runner.invoke(cli, ['--version'])
+    assert result.exit_code == 0
+    assert "gradebook, version" in result.output
+
+
+def test_version_resolved_only_on_demand(runner: CliRunner, monkeypatch):
+    """Test package metadata is read only when --version is passed, and only once."""
+    calls = []
+    monkeypatch.setattr("importlib.metadata.version", lambda name: calls.append(name) or "1.2.3")
+    get_version.cache_clear()
+
+    runner.invoke(cli, ['--help'])
+    assert calls == []
+
+    for _ in range(2):
+        result = runner.invoke(cli, ['--version'])
+        assert result.output.strip() == "gradebook, version 1.2.3"
+    assert calls == ["gradebook"]
+    get_version.cache_clear()
+
+
+def add_graded_course(db: Gradebook, code: str, semester: str = "Fall 2024") -> int:
+    """Add a course with one category and one assignment."""
+    course_id = db.add_course(code, f"{code} Course", semester)
+    db.add_categories(course_id, [("Exams", 1.0)])
+    category_id = db.get_category_id(code, "Exams", semester)
+    db.add_assignment(course_id, category_id, "Midterm", 100, 90)
+    return course_id
+
+
+def test_remove_courses_cascades(runner: CliRunner, test_db: Gradebook, test_db_path: str):
+    """Test removing several courses along with their categories and assignments."""
+    first = add_graded_course(test_db, "TEST401")
+    second = add_graded_course(test_db, "TEST402")
+    kept = add_graded_course(test_db, "TEST403")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'remove', 'courses',
+                                 'TEST401', 'test402', '--force'])
+    assert result.exit_code == 0
+    assert "Successfully removed 2 course(s)" in result.output
+
+    cursor = test_db.cursor
+    for table in ("courses", "categories", "assignments"):
+        cursor.execute(f"SELECT course_id FROM {table} WHERE course_id IN (?, ?, ?)", (first, second, kept))
+        assert {row[0] for row in cursor.fetchall()} == {kept}, table
+
+
+def test_remove_courses_missing_code(runner: CliRunner, test_db: Gradebook, test_db_path: str):
+    """Test that an unknown code aborts the whole removal."""
+    course_id = add_graded_course(test_db, "TEST404")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'remove', 'courses',
+                                 'TEST404', 'NOPE999', '--force'])
+    assert "Course(s) not found: NOPE999" in result.output
+
+    test_db.cursor.execute("SELECT COUNT(*) FROM courses WHERE course_id = ?", (course_id,))
+    assert test_db.cursor.fetchone()[0] == 1
+
+
+def test_remove_courses_ambiguous_code(runner: CliRunner, test_db: Gradebook, test_db_path: str):
+    """Test that a code offered in several semesters needs --semester."""
+    add_graded_course(test_db, "TEST405", "Fall 2024")
+    add_graded_course(test_db, "TEST405", "Spring 2025")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'remove', 'courses', 'TEST405', '--force'])
+    assert "Multiple sections found for TEST405" in result.output
+    test_db.cursor.execute("SELECT COUNT(*) FROM courses WHERE course_code = 'TEST405'")
+    assert test_db.cursor.fetchone()[0] == 2
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'remove', 'courses', 'TEST405',
+                                 '--semester', 'Fall 2024', '--force'])
+    assert "Successfully removed 1 course(s)" in result.output
+    test_db.cursor.execute("SELECT semester FROM courses WHERE course_code = 'TEST405'")
+    assert test_db.cursor.fetchall() == [("Spring 2025",)]
+
+
+def test_parse_category_spec():
+    """Test parsing a category spec into (name, weight) pairs."""
+    assert parse_category_spec("Homework:0.4, Exams:0.6") == [("Homework", 0.4), ("Exams", 0.6)]
+
+
+@pytest.mark.parametrize("spec", ["Homework=0.4,Exams:0.6", "Homework:forty,Exams:0.6"])
+def test_parse_category_spec_malformed(spec):
+    """Test that a malformed spec is rejected."""
+    with pytest.raises(click.BadParameter, match="Expected 'Name:weight"):
+        parse_category_spec(spec)
+
+
+def test_parse_category_spec_bad_total():
+    """Test that a spec whose weights don't sum to 100% is rejected."""
+    with pytest.raises(click.BadParameter, match="Weights must sum to 100%"):
+        parse_category_spec("Homework:0.4,Exams:0.5")
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("Homework:1.5,Exams:-0.5", "Weight for Homework must be between 0 and 1"),
+    ("Homework:0,Exams:1", "Weight for Homework must be between 0 and 1"),
+    (" :0.4,Exams:0.6", "Category names cannot be empty"),
+    ("Exams:0.4,exams:0.6", "Duplicate category name: exams"),
+])
+def test_parse_category_spec_bad_category(spec, message):
+    """Test that out-of-range weights, empty names and duplicate names are rejected."""
+    with pytest.raises(click.BadParameter, match=message):
+        parse_category_spec(spec)
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("Homework:0.4,Exams:0.5", "Weights must sum to 100%"),
+    ("A:1.5,B:-0.5", "Weight for A must be between 0 and 1"),
+    ("Exams:0.5,Exams:0.5", "Duplicate category name: Exams"),
+])
+def test_add_categories_spec_rejected(runner: CliRunner, test_db: Gradebook, test_db_path: str,
+                                      spec: str, message: str):
+    """Test that add categories --spec validates before writing anything."""
+    course_id = test_db.add_course("TEST406", "Spec Test", "Fall 2024")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'add', 'categories', 'TEST406',
+                                 '--spec', spec])
+    assert result.exit_code != 0
+    assert message in result.output
+    assert "Current Categories" not in result.output
+    test_db.cursor.execute("SELECT COUNT(*) FROM categories WHERE course_id = ?", (course_id,))
+    assert test_db.cursor.fetchone()[0] == 0
+
+
+@pytest.mark.parametrize("options, message", [
+    (['--earned', '120'], "Earned points cannot exceed max points"),
+    (['--max', '50'], "Earned points cannot exceed max points"),
+    (['--max', '0'], "Max points must be greater than 0"),
+    (['--earned', '-1'], "Earned points cannot be negative"),
+])
+def test_edit_assignment_check_messages(runner: CliRunner, test_db: Gradebook, test_db_path: str,
+                                        options, message):
+    """Test that CHECK constraint failures surface as friendly messages."""
+    add_graded_course(test_db, "TEST407")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'edit', 'assignment',
+                                 'TEST407', 'Midterm', *options])
+    assert message in result.output
+
+    test_db.cursor.execute("SELECT earned_points, max_points FROM assignments WHERE title = 'Midterm'")
+    assert test_db.cursor.fetchone() == (90, 100)
+
+
+def test_view_courses_limit_offset(runner: CliRunner, test_db: Gradebook, test_db_path: str):
+    """Test paging through the course list."""
+    for code in ("TEST501", "TEST502", "TEST503"):
+        test_db.add_course(code, f"{code} Course", "Fall 2024")
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'view', 'courses',
+                                 '--limit', '1', '--offset', '1'])
+    assert result.exit_code == 0
+    assert sum(code in result.output for code in ("TEST501", "TEST502", "TEST503")) == 1
+
+
+def test_view_trends_low_scores(runner: CliRunner, test_db: Gradebook, test_db_path: str):
+    """Test that scores too low to draw a bar still get their statistics."""
+    course_id = test_db.add_course("TEST601", "Low Scores", "Fall 2024")
+    test_db.add_categories(course_id, [("Exams", 1.0)])
+    category_id = test_db.get_category_id("TEST601", "Exams", "Fall 2024")
+    test_db.add_assignment(course_id, category_id, "Quiz 1", 100, 0)
+    test_db.add_assignment(course_id, category_id, "Quiz 2", 100, 5)
+
+    result = runner.invoke(cli, ['--db-path', str(test_db_path), 'view', 'trends', 'TEST601'])
+    assert "No gradable assignments" not in result.output
+    assert "Latest Grade: 5.0%" in result.output
+    assert "Lowest Grade: 0.0%" in result.output
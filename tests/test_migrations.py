@@ -0,0 +1,210 @@
+# tests/test_migrations.py
+import importlib
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from gradebook.db import Gradebook
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# Schema as created before category_name gained its NOCASE collation
+LEGACY_SCHEMA = """
+    CREATE TABLE courses (
+        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_code TEXT NOT NULL,
+        course_title TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours >= 0),
+        UNIQUE(course_code, semester)
+    );
+    CREATE TABLE categories (
+        category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_id INTEGER,
+        category_name TEXT NOT NULL,
+        weight REAL NOT NULL CHECK (weight >= 0 AND weight <= 1),
+        FOREIGN KEY (course_id) REFERENCES courses(course_id) ON DELETE CASCADE,
+        UNIQUE(course_id, category_name)
+    );
+"""
+
+
+@pytest.fixture
+def load_migration(monkeypatch):
+    """Import a migration script by file name; they import _util as a sibling."""
+    monkeypatch.syspath_prepend(str(MIGRATIONS_DIR))
+
+    def load(name):
+        return importlib.import_module(name)
+    return load
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """Create a database with the legacy schema."""
+    db_path = tmp_path / "legacy.db"
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+    return db_path
+
+
+def test_normalize_weights_updates_lowercase_unallocated(load_migration, legacy_db):
+    """A lowercase 'unallocated' row is topped up rather than duplicated."""
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        conn.execute("INSERT INTO courses (course_code, course_title, semester) VALUES ('A', 'A', 'Fall 2024')")
+        conn.executemany("INSERT INTO categories (course_id, category_name, weight) VALUES (1, ?, ?)",
+                         [("Exams", 0.8), ("unallocated", 0.05)])
+        conn.commit()
+
+    load_migration("001_normalize_weights").migrate_database(legacy_db)
+
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        rows = conn.execute("""
+            SELECT category_name, weight FROM categories
+            WHERE course_id = 1 AND category_name = 'Unallocated' COLLATE NOCASE
+        """).fetchall()
+        total = conn.execute("SELECT SUM(weight) FROM categories WHERE course_id = 1").fetchone()[0]
+
+    assert len(rows) == 1
+    assert abs(rows[0][1] - 0.2) <= 0.0001
+    assert abs(total - 1.0) <= 0.0001
+
+
+def test_normalize_weights_creates_missing_unallocated(load_migration, legacy_db):
+    """Courses under 100% without an Unallocated row get one."""
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        conn.execute("INSERT INTO courses (course_code, course_title, semester) VALUES ('B', 'B', 'Fall 2024')")
+        conn.execute("INSERT INTO categories (course_id, category_name, weight) VALUES (1, 'Exams', 0.6)")
+        conn.commit()
+
+    load_migration("001_normalize_weights").migrate_database(legacy_db)
+
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        weight = conn.execute("""
+            SELECT weight FROM categories WHERE course_id = 1 AND category_name = 'Unallocated'
+        """).fetchone()[0]
+
+    assert abs(weight - 0.4) <= 0.0001
+
+
+def test_back_to_back_migrations_keep_separate_backups(load_migration, legacy_db):
+    """Running 001 then 002 immediately leaves one backup per migration."""
+    load_migration("001_normalize_weights").migrate_database(legacy_db)
+    load_migration("002_add_credit_hours").migrate_database(legacy_db)
+
+    backups = sorted(p.name for p in legacy_db.parent.glob(f"{legacy_db.name}.*.bak"))
+    assert len(backups) == 2
+    assert "001_normalize_weights" in backups[0]
+    assert "002_add_credit_hours" in backups[1]
+
+
+
+def credit_hours_db(tmp_path, credit_hours_column):
+    """Create a bare courses table, optionally with the given credit_hours definition."""
+    db_path = tmp_path / "courses.db"
+    column = f",\n        {credit_hours_column}" if credit_hours_column else ""
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.execute(f"""
+            CREATE TABLE courses (
+                course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                course_code TEXT NOT NULL,
+                course_title TEXT NOT NULL,
+                semester TEXT NOT NULL{column}
+            )
+        """)
+        conn.execute("INSERT INTO courses (course_code, course_title, semester) VALUES ('A', 'A', 'Fall 2024')")
+        conn.commit()
+    return db_path
+
+
+def allows_zero_credits(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        try:
+            with conn:
+                conn.execute("UPDATE courses SET credit_hours = 0")
+        except sqlite3.IntegrityError:
+            return False
+    return True
+
+
+def test_credit_hours_added_when_missing(load_migration, tmp_path, capsys):
+    """Databases without the column get it with the relaxed CHECK."""
+    db_path = credit_hours_db(tmp_path, None)
+
+    load_migration("002_add_credit_hours").migrate_database(db_path)
+
+    assert "Added credit_hours column" in capsys.readouterr().out
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("SELECT credit_hours FROM courses").fetchone() == (3,)
+    assert allows_zero_credits(db_path)
+
+
+def test_credit_hours_left_alone_when_relaxed(load_migration, tmp_path, capsys):
+    """A column that already allows zero credits is not touched."""
+    db_path = credit_hours_db(tmp_path, "credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours >= 0)")
+
+    load_migration("002_add_credit_hours").migrate_database(db_path)
+
+    assert "nothing to change" in capsys.readouterr().out
+    assert allows_zero_credits(db_path)
+
+
+def test_credit_hours_rebuilt_when_check_is_strict(load_migration, tmp_path, capsys):
+    """The old '> 0' CHECK is invisible to PRAGMA table_info but still triggers a rebuild."""
+    db_path = credit_hours_db(tmp_path, "credit_hours INTEGER NOT NULL DEFAULT 3 CHECK (credit_hours > 0)")
+    assert not allows_zero_credits(db_path)
+
+    load_migration("002_add_credit_hours").migrate_database(db_path)
+
+    assert "Recreated courses table" in capsys.readouterr().out
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("SELECT course_code, credit_hours FROM courses").fetchall() == [("A", 3)]
+    assert allows_zero_credits(db_path)
+
+
+def test_lookup_index_migration(load_migration, legacy_db):
+    """003 swaps the old single-column assignment index for the composite ones."""
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        conn.executescript("""
+            CREATE TABLE assignments (
+                assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                course_id INTEGER,
+                category_id INTEGER,
+                title TEXT NOT NULL,
+                max_points REAL NOT NULL,
+                earned_points REAL NOT NULL,
+                entry_date TEXT NOT NULL
+            );
+            CREATE INDEX idx_assign_course ON assignments(course_id);
+        """)
+
+    load_migration("003_add_lookup_indexes").migrate_database(legacy_db)
+
+    with closing(sqlite3.connect(legacy_db)) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_assign_course" not in indexes
+    assert {"idx_courses_semester", "idx_assign_cat", "idx_assignments_course"} <= indexes
+
+
+def test_opening_existing_database_does_not_write(tmp_path, monkeypatch):
+    """Opening and closing an initialized database issues no schema or maintenance writes."""
+    db_path = tmp_path / "gradebook.db"
+    Gradebook(db_path).close()
+
+    statements = []
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+    monkeypatch.setattr("gradebook.db.sqlite3.connect", traced_connect)
+
+    with Gradebook(db_path) as gradebook:
+        gradebook.cursor.execute("SELECT COUNT(*) FROM courses")
+
+    writes = [sql for sql in statements
+              if sql.lstrip().upper().startswith(("CREATE", "DROP", "INSERT", "UPDATE", "DELETE", "PRAGMA OPTIMIZE"))]
+    assert writes == []